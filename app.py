@@ -5,9 +5,17 @@ A zero-cost multimodal task management system for QA and Development.
 
 import streamlit as st
 from datetime import datetime
-from config import validate_credentials
+from pathlib import Path
+from config import validate_credentials, TASK_STATUSES
 from utils.auth import require_auth
 
+APP_CSS_PATH = Path(__file__).parent / ".streamlit" / "app.css"
+
+@st.cache_data
+def load_css(path: Path) -> str:
+    """Read a stylesheet once and wrap it in a <style> tag."""
+    return f"<style>\n{path.read_text(encoding='utf-8')}</style>"
+
 # Page configuration
 st.set_page_config(
     page_title="FLUX - Task Management",
@@ -20,81 +28,7 @@ st.set_page_config(
 require_auth()
 
 # Custom CSS for mobile responsiveness
-st.markdown("""
-<style>
-    /* Mobile-first responsive design */
-    .main-header {
-        font-size: 2rem;
-        font-weight: bold;
-        margin-bottom: 1rem;
-    }
-    
-    .subtitle {
-        font-size: 1.1rem;
-        color: #666;
-        margin-bottom: 2rem;
-    }
-    
-    /* Touch-friendly buttons */
-    .stButton>button {
-        min-height: 44px;
-        font-size: 16px;
-    }
-    
-    /* Card styling */
-    .task-card {
-        border: 1px solid #ddd;
-        border-radius: 8px;
-        padding: 1rem;
-        margin-bottom: 1rem;
-        background: white;
-    }
-    
-    .status-badge {
-        display: inline-block;
-        padding: 4px 12px;
-        border-radius: 12px;
-        font-size: 0.85rem;
-        font-weight: 600;
-    }
-    
-    .status-in-review {
-        background: #fff3cd;
-        color: #856404;
-    }
-    
-    .status-passed-review {
-        background: #ffe5cc;
-        color: #8b4513;
-    }
-    
-    .status-in-stage {
-        background: #cfe2ff;
-        color: #084298;
-    }
-    
-    .status-passed-stage {
-        background: #e0d5f5;
-        color: #6610f2;
-    }
-    
-    .status-done {
-        background: #d1e7dd;
-        color: #0f5132;
-    }
-    
-    /* Responsive adjustments */
-    @media (max-width: 768px) {
-        .main-header {
-            font-size: 1.5rem;
-        }
-        
-        .subtitle {
-            font-size: 1rem;
-        }
-    }
-</style>
-""", unsafe_allow_html=True)
+st.markdown(load_css(APP_CSS_PATH), unsafe_allow_html=True)
 
 def main():
     """Main application entry point."""
@@ -232,33 +166,38 @@ def show_home_page():
     
     st.divider()
     
-    # Stats (if sheets service is available)
+    # Stats (if sheets service is available). Imported here rather than at
+    # module scope so the heavy Google client stack only loads for this page.
     try:
-        from services.google_sheets import get_sheets_service
-        
-        sheets = get_sheets_service()
-        tasks = sheets.get_all_tasks()
+        from services.google_sheets import get_cached_tasks
+    except ImportError:
+        get_cached_tasks = None
+    
+    if get_cached_tasks is not None:
+        try:
+            # Cached for 60s so reruns don't hit the Sheets API
+            tasks = get_cached_tasks()
+        except Exception as e:
+            st.warning(f"Could not load stats: {str(e)}")
+            tasks = []
         
         if tasks:
             st.markdown("### 📊 Your Stats")
             
             col1, col2, col3, col4, col5, col6 = st.columns(6)
             
-            total = len(tasks)
-            in_review = len([t for t in tasks if t.get('Status') == 'In Review'])
-            passed_review = len([t for t in tasks if t.get('Status') == 'Passed In Review'])
-            in_stage = len([t for t in tasks if t.get('Status') == 'In Stage'])
-            passed_stage = len([t for t in tasks if t.get('Status') == 'Passed In Stage'])
-            done = len([t for t in tasks if t.get('Status') == 'Done'])
+            # Count statuses in a single pass, keyed on the configured statuses
+            counts = dict.fromkeys(TASK_STATUSES, 0)
+            for t in tasks:
+                status = t.get('Status', '')
+                counts[status] = counts.get(status, 0) + 1
             
-            col1.metric("Total", total)
-            col2.metric("In Review", in_review)
-            col3.metric("Passed Review", passed_review)
-            col4.metric("In Stage", in_stage)
-            col5.metric("Passed Stage", passed_stage)
-            col6.metric("Done", done)
-    except:
-        pass
+            col1.metric("Total", len(tasks))
+            col2.metric("In Review", counts['In Review'])
+            col3.metric("Passed Review", counts['Passed In Review'])
+            col4.metric("In Stage", counts['In Stage'])
+            col5.metric("Passed Stage", counts['Passed In Stage'])
+            col6.metric("Done", counts['Done'])
 
 def show_upload_preview():
     """Show preview of upload functionality."""
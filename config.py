@@ -4,13 +4,50 @@ Loads environment variables and defines application constants.
 """
 
 import os
+import threading
+from functools import lru_cache, wraps
+from itertools import chain
 from dotenv import load_dotenv
 import streamlit as st
 
 # Load environment variables from .env file
 load_dotenv()
 
+# Local service account file, checked once at import (never present on Cloud)
+SERVICE_ACCOUNT_FILE = os.getenv('GOOGLE_SERVICE_ACCOUNT_JSON', 'service_account.json')
+_HAS_SA_FILE = os.path.exists(SERVICE_ACCOUNT_FILE)
+
+# Raised when st.secrets is unavailable (no secrets.toml) or lacks a key
+_SECRETS_ERRORS = (KeyError, AttributeError, FileNotFoundError)
+
+def _cache_found(getter):
+    """
+    Cache a no-argument getter's result once it finds a value.
+    
+    Missing values (None or empty) are not cached, so credentials added
+    later are picked up without a restart. Like lru_cache, the wrapper has
+    a cache_clear() method.
+    """
+    found = []
+    lock = threading.Lock()
+    
+    @wraps(getter)
+    def wrapper():
+        with lock:
+            if not found:
+                value = getter()
+                if not value:
+                    return value
+                found.append(value)
+            return found[0]
+    
+    wrapper.cache_clear = found.clear
+    return wrapper
+
 # API Credentials
+# Getters are cached per process once they find a value; call
+# <getter>.cache_clear() to pick up a changed value.
+@_cache_found
 def get_gemini_api_key():
     """Get Gemini API key from environment or Streamlit secrets."""
     key = os.getenv('GEMINI_API_KEY')
@@ -19,10 +56,35 @@ def get_gemini_api_key():
     try:
         if hasattr(st, 'secrets') and 'GEMINI_API_KEY' in st.secrets:
             return st.secrets['GEMINI_API_KEY']
-    except:
+    except _SECRETS_ERRORS:
         pass
     return None
 
+@_cache_found
+def get_gemini_api_keys():
+    """
+    Get all Gemini API keys for quota failover.
+    Reads comma-separated GEMINI_API_KEYS from environment or Streamlit secrets,
+    falling back to the single GEMINI_API_KEY.
+    """
+    keys = os.getenv('GEMINI_API_KEYS')
+    if not keys:
+        try:
+            if hasattr(st, 'secrets') and 'GEMINI_API_KEYS' in st.secrets:
+                keys = st.secrets['GEMINI_API_KEYS']
+        except _SECRETS_ERRORS:
+            pass
+    if keys:
+        if isinstance(keys, str):
+            keys = keys.split(',')
+        # A tuple, so callers can't change the cached value
+        keys = tuple(key.strip() for key in keys if key.strip())
+        if keys:
+            return keys
+    key = get_gemini_api_key()
+    return (key,) if key else ()
+
+@_cache_found
 def get_drive_folder_id():
     """Get Google Drive folder ID from environment or Streamlit secrets."""
     folder_id = os.getenv('GOOGLE_DRIVE_FOLDER_ID')
@@ -31,10 +93,11 @@ def get_drive_folder_id():
     try:
         if hasattr(st, 'secrets') and 'GOOGLE_DRIVE_FOLDER_ID' in st.secrets:
             return st.secrets['GOOGLE_DRIVE_FOLDER_ID']
-    except:
+    except _SECRETS_ERRORS:
         pass
     return None
 
+@_cache_found
 def get_sheets_id():
     """Get Google Sheets ID from environment or Streamlit secrets."""
     sheet_id = os.getenv('GOOGLE_SHEETS_ID')
@@ -43,21 +106,32 @@ def get_sheets_id():
     try:
         if hasattr(st, 'secrets') and 'GOOGLE_SHEETS_ID' in st.secrets:
             return st.secrets['GOOGLE_SHEETS_ID']
-    except:
+    except _SECRETS_ERRORS:
         pass
     return None
 
 def get_service_account_path():
-    """Get path to service account JSON file or dict from secrets."""
-    import json
-    import tempfile
-    
+    """Get path to the service account JSON file, written from secrets if needed."""
     # Try environment variable first (local development)
-    path = os.getenv('GOOGLE_SERVICE_ACCOUNT_JSON', 'service_account.json')
-    if os.path.exists(path):
-        return path
+    if _HAS_SA_FILE:
+        return SERVICE_ACCOUNT_FILE
     
     # Try Streamlit secrets (cloud deployment)
+    return _write_service_account_secrets() or 'service_account.json'
+
+@_cache_found
+def _write_service_account_secrets():
+    """
+    Write the service account from Streamlit secrets to a temp file.
+    Cached, so the temp file is written at most once per process.
+    
+    Returns:
+        Temp file path, or None if no secrets are configured or writing failed
+    """
+    import atexit
+    import json
+    import tempfile
+    
     try:
         if hasattr(st, 'secrets') and 'service_account' in st.secrets:
             # Create a temporary file with the service account JSON
@@ -68,31 +142,68 @@ def get_service_account_path():
             json.dump(service_account_info, temp_file)
             temp_file.close()
             
+            # Remove the credentials file when the process exits
+            atexit.register(os.unlink, temp_file.name)
+            
             return temp_file.name
+    except _SECRETS_ERRORS:
+        pass  # No secrets configured; fall back to the default path
     except Exception as e:
-        pass
+        # e.g. an unwritable temp dir or secrets that don't serialize to JSON
+        from utils.logger import setup_logger, log_error
+        log_error(setup_logger(__name__), e, "Failed to write service account secrets to a temp file")
     
-    return 'service_account.json'
+    return None
 
 def get_service_account_info():
-    """Get service account as dictionary (for direct use)."""
+    """Get service account as dictionary (for direct use); each call gets its own copy."""
+    info = _load_service_account_info()
+    return dict(info) if info else None
+
+@_cache_found
+def _load_service_account_info():
+    """Read the service account from Streamlit secrets or the local file (see get_service_account_info)."""
     import json
     
     # Try Streamlit secrets first
     try:
         if hasattr(st, 'secrets') and 'service_account' in st.secrets:
             return dict(st.secrets['service_account'])
-    except:
+    except _SECRETS_ERRORS:
         pass
     
     # Try local file
-    path = os.getenv('GOOGLE_SERVICE_ACCOUNT_JSON', 'service_account.json')
-    if os.path.exists(path):
-        with open(path, 'r') as f:
+    if _HAS_SA_FILE:
+        with open(SERVICE_ACCOUNT_FILE, 'r') as f:
             return json.load(f)
     
     return None
 
+# OAuth scopes for the service account, shared by the Drive and Sheets clients
+GOOGLE_API_SCOPES = (
+    'https://www.googleapis.com/auth/spreadsheets',
+    'https://www.googleapis.com/auth/drive.file'
+)
+
+@lru_cache(maxsize=4)
+def load_service_account_credentials(scopes: tuple = GOOGLE_API_SCOPES):
+    """
+    Load service account credentials for the given scopes.
+    Cached, so the key file is parsed (and the token refreshed) once per
+    process and scope set rather than once per client.
+    """
+    from google.oauth2 import service_account
+    
+    service_account_path = get_service_account_path()
+    
+    if not os.path.exists(service_account_path):
+        raise FileNotFoundError(f"Service account file not found: {service_account_path}")
+    
+    return service_account.Credentials.from_service_account_file(
+        service_account_path,
+        scopes=list(scopes)
+    )
+
 # File Upload Configuration
 ALLOWED_FILE_TYPES = {
     'video': ['.mp4', '.mov'],
@@ -101,12 +212,15 @@ ALLOWED_FILE_TYPES = {
     'image': ['.png', '.jpg', '.jpeg']
 }
 
-# Flatten for easy validation
-ALLOWED_EXTENSIONS = []
-for extensions in ALLOWED_FILE_TYPES.values():
-    ALLOWED_EXTENSIONS.extend(extensions)
+# Flatten into a set for O(1) membership checks during validation
+ALLOWED_EXTENSIONS = frozenset(chain.from_iterable(ALLOWED_FILE_TYPES.values()))
+
+# Reverse map so a file's category is a single dict lookup
+EXT_TO_CATEGORY = {ext: category for category, exts in ALLOWED_FILE_TYPES.items() for ext in exts}
 
 MAX_FILE_SIZE_MB = 5000  # Maximum file size in MB (5GB)
+DRIVE_UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024  # Resumable upload chunk size (8MB)
+DRIVE_RESUMABLE_THRESHOLD = 5 * 1024 * 1024  # Smaller files go up in one request (5MB)
 
 # Task Statuses
 TASK_STATUSES = ["In Review", "Passed In Review", "In Stage", "Passed In Stage", "Done"]
@@ -137,7 +251,7 @@ def validate_credentials():
     """
     missing = []
     
-    if not get_gemini_api_key():
+    if not get_gemini_api_keys():
         missing.append("GEMINI_API_KEY")
     
     if not get_drive_folder_id():
@@ -152,3 +266,8 @@ def validate_credentials():
         missing.append("GOOGLE_SERVICE_ACCOUNT_JSON (not configured)")
     
     return len(missing) == 0, missing
+
+# Credentials don't change during a session, so skip re-probing them on every
+# rerun. Only cache under the Streamlit runtime (scripts import config too).
+if st.runtime.exists():
+    validate_credentials = st.cache_data(ttl=600, show_spinner=False)(validate_credentials)
@@ -24,10 +24,10 @@ print("=" * 60)
 print()
 
 try:
-    # List all models
-    models = genai.list_models()
+    # List all models (materialized once; list_models() makes an API call)
+    models = list(genai.list_models())
     
-    print(f"Found {len(list(genai.list_models()))} models:")
+    print(f"Found {len(models)} models:")
     print()
     
     for model in models:
@@ -4,13 +4,13 @@ Allows users to upload multimodal files for AI analysis.
 """
 
 import streamlit as st
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime
 import io
+import json
+from PIL import Image
 
 from utils.file_validator import validate_uploaded_file
-from services.google_drive import get_drive_service
-from services.google_sheets import get_sheets_service
-from services.gemini_processor import get_gemini_processor
 from utils.auth import require_auth
 from utils.logger import setup_logger
 
@@ -68,19 +68,17 @@ if uploaded_file:
     with col3:
         st.metric("File Type", category.title())
     
+    # Underlying bytes of the upload; getvalue() neither copies nor moves the
+    # file pointer, so the preview and the AI analysis can share it
+    file_bytes = uploaded_file.getvalue()
+    
     # Show image preview if applicable
     if category == 'image':
         try:
-            from PIL import Image
-            import io
-            # Read the file data once for PIL and then reset pointer for later use
-            file_data_for_preview = uploaded_file.read()
-            image = Image.open(io.BytesIO(file_data_for_preview))
-            uploaded_file.seek(0)  # Reset file pointer for subsequent reads
+            image = Image.open(io.BytesIO(file_bytes))
             st.image(image, caption="Preview", use_column_width=True)
         except Exception as e:
             st.warning(f"Could not display image preview: {e}")
-            uploaded_file.seek(0) # Ensure pointer is reset even if preview fails
     
     st.divider()
     
@@ -96,47 +94,63 @@ if uploaded_file:
         status_text = st.empty()
         
         try:
-            # Step 1: Upload to Google Drive
-            status_text.text("⬆️ Uploading to Google Drive...")
-            progress_bar.progress(20)
-            
-            drive_service = get_drive_service()
-            
-            # Get organized folder
-            folder_id = drive_service.organize_by_date(category)
-            
-            # Read file data
-            file_data = uploaded_file.read()
-            
-            # Upload file
-            drive_result = drive_service.upload_file(
-                file_data=file_data,
-                filename=uploaded_file.name,
-                mime_type=uploaded_file.type,
-                folder_id=folder_id
-            )
-            
-            evidence_link = drive_result['webViewLink']
+            # Service clients pull in googleapiclient/gspread/genai, so only
+            # import them once the user actually starts an upload
+            from services.google_drive import get_drive_service
+            from services.google_sheets import get_sheets_service, clear_task_caches
+            from services.gemini_processor import get_gemini_processor, wait_future
             
-            progress_bar.progress(40)
-            st.success(f"✅ Uploaded to Drive: [View Evidence]({evidence_link})")
+            # One timestamp for both the Drive folder and the task record
+            now = datetime.now()
+            upload_date = now.strftime('%Y-%m-%d %H:%M:%S')
             
-            # Step 2: AI Analysis
-            status_text.text("🤖 Analyzing with Gemini AI...")
-            progress_bar.progress(50)
+            # Step 1 & 2: Upload to Google Drive and analyze with Gemini in parallel
+            status_text.text("⬆️ Uploading to Google Drive and 🤖 analyzing with Gemini AI...")
+            progress_bar.progress(20)
             
+            drive_service = get_drive_service()
             gemini = get_gemini_processor()
             
-            # Reset file pointer for AI processing if it was read before
-            file_data_for_ai = io.BytesIO(file_data)
+            # Both calls are network-bound, so run them concurrently. Each one
+            # gets its own cursor over the upload; Drive streams it in chunks.
+            upload_progress = {'done': 0.0}
+            uploaded_file.seek(0)
             
-            ai_result = gemini.process_file(
-                file_data=file_data_for_ai,
+            ai_future = gemini.process_file_async(
+                file_data=file_bytes,
                 filename=uploaded_file.name,
                 file_category=category,
                 context_notes=context_notes
             )
             
+            def upload_to_drive():
+                # Resolve the dated folder off the script thread too, so its
+                # lookups overlap the Gemini analysis instead of preceding it
+                folder_id = drive_service.organize_by_date(category, when=now)
+                return drive_service.upload_file(
+                    file_data=uploaded_file,
+                    filename=uploaded_file.name,
+                    mime_type=uploaded_file.type,
+                    folder_id=folder_id,
+                    progress_callback=lambda done: upload_progress.update(done=done)
+                )
+            
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                drive_future = executor.submit(upload_to_drive)
+                
+                # Widgets can only be updated from the script thread, so poll here
+                while not wait([drive_future], timeout=0.25).done:
+                    progress_bar.progress(20 + int(upload_progress['done'] * 30))
+                
+                drive_result = drive_future.result()
+                evidence_link = drive_result['webViewLink']
+                
+                progress_bar.progress(50)
+                st.success(f"✅ Uploaded to Drive: [View Evidence]({evidence_link})")
+                
+                status_text.text("🤖 Analyzing with Gemini AI...")
+                ai_result = wait_future(ai_future)
+            
             progress_bar.progress(80)
             
             # Extract task name and summary
@@ -151,17 +165,21 @@ if uploaded_file:
             
             sheets_service = get_sheets_service()
             
+            # Serialized once: stored in the sheet and shown in the expander below
+            ai_result_json = json.dumps(ai_result, separators=(',', ':'), ensure_ascii=False)
+            
             task_data = {
                 'task_name': task_name,
-                'upload_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                'upload_date': upload_date,
                 'status': 'In Review',
                 'file_type': category,
                 'evidence_link': evidence_link,
-                'ai_summary': str(ai_result),  # Store full JSON
+                'ai_summary': ai_result_json,  # Store full JSON
                 'context_notes': context_notes
             }
             
             task_id = sheets_service.create_task(task_data)
+            clear_task_caches()  # Show the new task on the board right away
             
             progress_bar.progress(100)
             status_text.text("✅ Complete!")
@@ -193,7 +211,7 @@ if uploaded_file:
             
             # Show full AI response in expander
             with st.expander("🔍 View Full AI Analysis"):
-                st.json(ai_result)
+                st.json(ai_result_json)
             
             logger.info(f"Successfully created task: {task_name} (ID: {task_id})")
             
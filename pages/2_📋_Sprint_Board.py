@@ -3,16 +3,187 @@ Sprint Board Page
 Kanban-style task management interface.
 """
 
+import json
 import streamlit as st
+from collections import defaultdict
 from datetime import datetime, timedelta
 
-from services.google_sheets import get_sheets_service
+from services.google_sheets import get_sheets_service, get_cached_task_table, clear_task_caches
 from config import TASK_STATUSES
 from utils.logger import setup_logger
 from utils.auth import require_auth
+from utils.toast import success_toast, error_toast, show_pending_toasts
 
 logger = setup_logger(__name__)
 
+# Position of each status in the selectbox options
+STATUS_INDEX = {status: i for i, status in enumerate(TASK_STATUSES)}
+
+STATUS_COLORS = {
+    "In Review": "🟡",
+    "Passed In Review": "🟠",
+    "In Stage": "🔵",
+    "Passed In Stage": "🟣",
+    "Done": "🟢"
+}
+
+# Static task card header. The top margin spaces consecutive cards, so no
+# separate spacer element is needed.
+CARD_TEMPLATE = (
+    '<div style="border:1px solid #ddd;border-radius:8px;padding:1rem;'
+    'margin:1rem 0;background:white;">'
+    '<h4 style="margin:0 0 .5rem 0;">{name}</h4>'
+    '<p style="font-size:.85rem;color:#666;margin:0;">'
+    '📅 {date}<br>📁 {file_type}</p></div>'
+)
+
+@st.cache_data(show_spinner=False, max_entries=2048)
+def _parse_summary(ai_summary: str):
+    """
+    Parse a stored AI summary once per distinct value.
+    Returns the JSON object as a dict, otherwise a plain-text preview
+    (e.g. for notes) truncated to 200 characters.
+    """
+    try:
+        summary_data = json.loads(ai_summary) if ai_summary else {}
+        if isinstance(summary_data, dict):
+            return summary_data
+    except (ValueError, TypeError):
+        pass
+    
+    text = str(ai_summary)
+    return text[:200] + "..." if len(text) > 200 else text
+
+def render_task_card_html(task: dict) -> str:
+    """Build the static header HTML for a task card."""
+    file_type = task.get('File Type', '')
+    return CARD_TEMPLATE.format_map({
+        'name': task.get('Task Name', 'Untitled'),
+        'date': task.get('Upload Date', ''),
+        'file_type': file_type.title() if file_type else 'Unknown'
+    })
+
+@st.fragment
+def render_task_card_widgets(task: dict, sheets_service):
+    """
+    Render the interactive parts of a task card (summary, status, edit).
+    Runs as a fragment, so interacting with one card reruns only that card.
+    """
+    
+    task_id = task.get('Task ID', '')
+    task_name = task.get('Task Name', 'Untitled')
+    status = task.get('Status', 'In Review')
+    evidence_link = task.get('Evidence Link', '')
+    ai_summary = task.get('AI Summary', '')
+    
+    # Card container
+    with st.container():
+        # Summary (toggled). Unlike an expander, a collapsed card skips
+        # parsing and rendering the summary entirely.
+        expanded_key = f"expanded_{task_id}"
+        editing_key = f"editing_{task_id}"
+        expanded = st.session_state.get(expanded_key, False)
+        
+        if st.button(
+            "📝 Hide Summary" if expanded else "📝 View Summary",
+            key=f"toggle_{task_id}",
+            use_container_width=True
+        ):
+            st.session_state[expanded_key] = not expanded
+            st.rerun(scope="fragment")
+        
+        if expanded:
+            with st.container(border=True):
+                summary_data = _parse_summary(ai_summary)
+                
+                if isinstance(summary_data, dict):
+                    st.markdown(summary_data.get('summary', ai_summary))
+                    
+                    # Show other fields if available
+                    for key, value in summary_data.items():
+                        if key != 'summary' and key != 'task_name':
+                            st.markdown(f"**{key.replace('_', ' ').title()}:** {value}")
+                else:
+                    st.text(summary_data)
+        
+        # Actions
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            if evidence_link:
+                st.link_button("👁️ Evidence", evidence_link, use_container_width=True)
+        
+        with col2:
+            # Status update
+            new_status = st.selectbox(
+                "Status",
+                TASK_STATUSES,
+                index=STATUS_INDEX.get(status, 0),
+                key=f"status_{task_id}",
+                label_visibility="collapsed"
+            )
+            
+            if new_status != status:
+                with st.spinner("Updating..."):
+                    try:
+                        sheets_service.update_task_status(task_id, new_status)
+                        success_toast(f"Task moved to {new_status}", before_rerun=True)
+                        clear_task_caches()  # Refetch tasks to show update
+                        st.rerun()  # Full rerun: the card moves to another column
+                    except Exception as e:
+                        error_toast(f"Failed to update: {str(e)}")
+        
+        with col3:
+            # Edit button
+            if st.button("✏️", key=f"edit_{task_id}", use_container_width=True, help="Edit task"):
+                st.session_state[editing_key] = True
+                st.rerun(scope="fragment")
+        
+        # Edit modal
+        if st.session_state.get(editing_key, False):
+            with st.expander("✏️ Edit Task", expanded=True):
+                new_name = st.text_input(
+                    "Task Name",
+                    value=task_name,
+                    key=f"name_{task_id}"
+                )
+                
+                context_notes = task.get('Context Notes', '')
+                new_notes = st.text_area(
+                    "Context Notes",
+                    value=context_notes,
+                    key=f"notes_{task_id}",
+                    height=100
+                )
+                
+                col_save, col_cancel = st.columns(2)
+                
+                with col_save:
+                    if st.button("💾 Save", key=f"save_{task_id}", use_container_width=True):
+                        updates = {}
+                        if new_name != task_name:
+                            updates['Task Name'] = new_name
+                        if new_notes != context_notes:
+                            updates['Context Notes'] = new_notes
+                        
+                        if updates:
+                            with st.spinner("Saving..."):
+                                try:
+                                    sheets_service.update_task(task_id, updates)
+                                    success_toast("Task updated successfully!", before_rerun=True)
+                                    st.session_state[editing_key] = False
+                                    clear_task_caches()
+                                    st.rerun()  # Full rerun: the header outside the fragment changed
+                                except Exception as e:
+                                    error_toast(f"Failed to save: {str(e)}")
+                        else:
+                            st.info("No changes to save")
+                
+                with col_cancel:
+                    if st.button("❌ Cancel", key=f"cancel_{task_id}", use_container_width=True):
+                        st.session_state[editing_key] = False
+                        st.rerun(scope="fragment")
+
 st.set_page_config(
     page_title="Sprint Board - FLUX",
     page_icon="📋",
@@ -22,6 +193,9 @@ st.set_page_config(
 # Require authentication
 require_auth()
 
+# Confirmations from the update that triggered this rerun
+show_pending_toasts()
+
 st.title("📋 Sprint Board")
 st.markdown("Manage your tasks in a Kanban-style board.")
 
@@ -44,45 +218,41 @@ with col3:
 
 st.divider()
 
-# Load tasks with loading indicator
+# Load tasks with loading indicator (stays None if loading fails)
+all_tasks = None
+
 with st.spinner("📊 Loading tasks..."):
     try:
-        from services.google_sheets import get_cached_tasks
-        
         # Use cached data for better performance
-        all_tasks = get_cached_tasks()
+        table = get_cached_task_table()
+        all_tasks = table.rows
         
-        # Apply filters
-        filtered_tasks = all_tasks
+        # Apply filters and group by status in a single pass
+        query = search_query.casefold() if search_query else None
+        type_filter = file_type_filter if file_type_filter != "All Types" else None
         
-        if search_query:
-            filtered_tasks = [
-                task for task in filtered_tasks 
-                if search_query.lower() in task.get('Task Name', '').lower()
-            ]
+        # Unknown statuses get a bucket too but are never rendered
+        tasks_by_status = defaultdict(list)
+        total_filtered = 0
         
-        if file_type_filter != "All Types":
-            filtered_tasks = [
-                task for task in filtered_tasks 
-                if task.get('File Type', '') == file_type_filter
-            ]
+        names_lc, file_types, statuses = table.names_lc, table.file_types, table.statuses
+        for i in range(len(all_tasks)):
+            if query and query not in names_lc[i]:
+                continue
+            if type_filter and file_types[i] != type_filter:
+                continue
+            
+            total_filtered += 1
+            tasks_by_status[statuses[i]].append(all_tasks[i])
         
-        # Display board stats
+        # Display board stats (from all filtered tasks, not just the current page)
         col1, col2, col3, col4, col5, col6 = st.columns(6)
         col1.metric("📊 Total", len(all_tasks), delta=None)
-        
-        # Calculate counts for display (from all filtered tasks, not just current page)
-        all_filtered_by_status = {status: [] for status in TASK_STATUSES}
-        for task in filtered_tasks:
-            status = task.get('Status', 'In Review')
-            if status in all_filtered_by_status:
-                all_filtered_by_status[status].append(task)
-        
-        col2.metric("🟡 In Review", len(all_filtered_by_status.get('In Review', [])))
-        col3.metric("🟠 Passed Review", len(all_filtered_by_status.get('Passed In Review', [])))
-        col4.metric("🔵 In Stage", len(all_filtered_by_status.get('In Stage', [])))
-        col5.metric("🟣 Passed Stage", len(all_filtered_by_status.get('Passed In Stage', [])))
-        col6.metric("🟢 Done", len(all_filtered_by_status.get('Done', [])))
+        col2.metric("🟡 In Review", len(tasks_by_status['In Review']))
+        col3.metric("🟠 Passed Review", len(tasks_by_status['Passed In Review']))
+        col4.metric("🔵 In Stage", len(tasks_by_status['In Stage']))
+        col5.metric("🟣 Passed Stage", len(tasks_by_status['Passed In Stage']))
+        col6.metric("🟢 Done", len(tasks_by_status['Done']))
         
         st.divider()
         
@@ -91,13 +261,13 @@ with st.spinner("📊 Loading tasks..."):
         
         with pcol1:
             if search_query or file_type_filter != "All Types":
-                st.caption(f"🔍 Showing {len(filtered_tasks)} of {len(all_tasks)} tasks")
+                st.caption(f"🔍 Showing {total_filtered} of {len(all_tasks)} tasks")
             else:
-                st.caption(f"📊 {len(filtered_tasks)} tasks")
+                st.caption(f"📊 {total_filtered} tasks")
         
         with pcol2:
             items_per_page = st.selectbox(
-                "Per page",
+                "Per column",
                 options=[25, 50, 100, "All"],
                 index=1,
                 key="items_per_page"
@@ -107,10 +277,11 @@ with st.spinner("📊 Loading tasks..."):
         if 'current_page' not in st.session_state:
             st.session_state.current_page = 1
         
-        # Calculate pagination
+        # Calculate pagination. Pages slice each (already grouped) column, so
+        # the page count is driven by the longest column.
         if items_per_page != "All":
-            total_pages = (len(filtered_tasks) + items_per_page - 1) // items_per_page
-            total_pages = max(1, total_pages)
+            longest_column = max(len(tasks_by_status[status]) for status in TASK_STATUSES)
+            total_pages = max(1, (longest_column + items_per_page - 1) // items_per_page)
             
             # Ensure current page is valid
             if st.session_state.current_page > total_pages:
@@ -132,46 +303,28 @@ with st.spinner("📊 Loading tasks..."):
             
             # Calculate slice
             start_idx = (st.session_state.current_page - 1) * items_per_page
-            end_idx = start_idx + items_per_page
-            
-            # Slice filtered tasks for current page
-            page_tasks = filtered_tasks[start_idx:end_idx]
+            page_slice = slice(start_idx, start_idx + items_per_page)
         else:
-            page_tasks = filtered_tasks
-        
-        # Re-group paginated tasks by status
-        tasks_by_status = {status: [] for status in TASK_STATUSES}
-        
-        for task in page_tasks:
-            status = task.get('Status', 'In Review')
-            if status in tasks_by_status:
-                tasks_by_status[status].append(task)
+            page_slice = slice(None)
         
         st.divider()
         
         # Kanban columns - 5 columns
         cols = st.columns(5)
-        
-        status_colors = {
-            "In Review": "🟡",
-            "Passed In Review": "🟠",
-            "In Stage": "🔵",
-            "Passed In Stage": "🟣",
-            "Done": "🟢"
-        }
+        sheets_service = get_sheets_service()
         
         for idx, status in enumerate(TASK_STATUSES):
             with cols[idx]:
-                st.markdown(f"### {status_colors[status]} {status}")
-                st.markdown(f"*{len(tasks_by_status[status])} tasks*")
-                
-                tasks = tasks_by_status[status]
+                column_tasks = tasks_by_status[status]
+                tasks = column_tasks[page_slice]
+                st.markdown(f"### {STATUS_COLORS[status]} {status}\n\n*{len(column_tasks)} tasks*")
                 
                 if not tasks:
                     st.info(f"No tasks in {status}")
                 else:
                     for task in tasks:
-                        render_task_card(task, get_sheets_service())
+                        st.markdown(render_task_card_html(task), unsafe_allow_html=True)
+                        render_task_card_widgets(task, sheets_service)
                 
                 st.markdown("---")
     
@@ -181,143 +334,8 @@ with st.spinner("📊 Loading tasks..."):
         st.info("💡 **Try:**\n- Refresh the page\n- Check your internet connection\n- Verify Google Sheets access")
         logger.error(f"Board error: {str(e)}")
 
-def render_task_card(task: dict, sheets_service):
-    """Render a task card with actions."""
-    
-    task_id = task.get('Task ID', '')
-    task_name = task.get('Task Name', 'Untitled')
-    upload_date = task.get('Upload Date', '')
-    status = task.get('Status', 'In Review')
-    file_type = task.get('File Type', '')
-    evidence_link = task.get('Evidence Link', '')
-    ai_summary = task.get('AI Summary', '')
-    
-    # Card container
-    with st.container():
-        st.markdown(f"""
-        <div style="
-            border: 1px solid #ddd;
-            border-radius: 8px;
-            padding: 1rem;
-            margin-bottom: 1rem;
-            background: white;
-        ">
-            <h4 style="margin: 0 0 0.5rem 0;">{task_name}</h4>
-            <p style="font-size: 0.85rem; color: #666; margin: 0;">
-                📅 {upload_date}<br>
-                📁 {file_type.title() if file_type else 'Unknown'}
-            </p>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        # Summary (expandable)
-        with st.expander("📝 View Summary"):
-            try:
-                # Try to parse JSON summary
-                import json
-                summary_data = json.loads(ai_summary) if ai_summary else {}
-                
-                if isinstance(summary_data, dict):
-                    summary_text = summary_data.get('summary', ai_summary)
-                else:
-                    summary_text = str(ai_summary)
-                    
-                st.markdown(summary_text)
-                
-                # Show other fields if available
-                if isinstance(summary_data, dict):
-                    for key, value in summary_data.items():
-                        if key != 'summary' and key != 'task_name':
-                            st.markdown(f"**{key.replace('_', ' ').title()}:** {value}")
-            except:
-                st.text(ai_summary[:200] + "..." if len(ai_summary) > 200 else ai_summary)
-        
-        # Actions
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            if evidence_link:
-                st.link_button("👁️ Evidence", evidence_link, use_container_width=True)
-        
-        with col2:
-            # Status update
-            new_status = st.selectbox(
-                "Status",
-                TASK_STATUSES,
-                index=TASK_STATUSES.index(status),
-                key=f"status_{task_id}",
-                label_visibility="collapsed"
-            )
-            
-            if new_status != status:
-                with st.spinner("Updating..."):
-                    try:
-                        sheets_service.update_task_status(task_id, new_status)
-                        from utils.toast import success_toast
-                        success_toast(f"Task moved to {new_status}")
-                        st.cache_data.clear()  # Clear cache to show update
-                        st.rerun()
-                    except Exception as e:
-                        from utils.toast import error_toast
-                        error_toast(f"Failed to update: {str(e)}")
-        
-        with col3:
-            # Edit button
-            if st.button("✏️", key=f"edit_{task_id}", use_container_width=True, help="Edit task"):
-                st.session_state[f"editing_{task_id}"] = True
-                st.rerun()
-        
-        # Edit modal
-        if st.session_state.get(f"editing_{task_id}", False):
-            with st.expander("✏️ Edit Task", expanded=True):
-                new_name = st.text_input(
-                    "Task Name",
-                    value=task_name,
-                    key=f"name_{task_id}"
-                )
-                
-                context_notes = task.get('Context Notes', '')
-                new_notes = st.text_area(
-                    "Context Notes",
-                    value=context_notes,
-                    key=f"notes_{task_id}",
-                    height=100
-                )
-                
-                col_save, col_cancel = st.columns(2)
-                
-                with col_save:
-                    if st.button("💾 Save", key=f"save_{task_id}", use_container_width=True):
-                        updates = {}
-                        if new_name != task_name:
-                            updates['Task Name'] = new_name
-                        if new_notes != context_notes:
-                            updates['Context Notes'] = new_notes
-                        
-                        if updates:
-                            with st.spinner("Saving..."):
-                                try:
-                                    sheets_service.update_task(task_id, updates)
-                                    from utils.toast import success_toast
-                                    success_toast("Task updated successfully!")
-                                    st.session_state[f"editing_{task_id}"] = False
-                                    st.cache_data.clear()
-                                    st.rerun()
-                                except Exception as e:
-                                    from utils.toast import error_toast
-                                    error_toast(f"Failed to save: {str(e)}")
-                        else:
-                            st.info("No changes to save")
-                
-                with col_cancel:
-                    if st.button("❌ Cancel", key=f"cancel_{task_id}", use_container_width=True):
-                        st.session_state[f"editing_{task_id}"] = False
-                        st.rerun()
-        
-        st.markdown("<br>", unsafe_allow_html=True)
-
 # Empty state
-if 'all_tasks' in locals() and len(all_tasks) == 0:
+if all_tasks is not None and len(all_tasks) == 0:
     st.info("📭 No tasks yet. Upload your first evidence file to get started!")
     if st.button("➕ Upload Evidence"):
         st.switch_page("pages/1_📤_Upload.py")
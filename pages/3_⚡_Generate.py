@@ -4,15 +4,59 @@ AI-powered generation of test cases, requirement docs, and scrum emails.
 """
 
 import streamlit as st
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-import io
 
-from services.google_sheets import get_sheets_service
-from services.gemini_processor import get_gemini_processor
+from services.google_sheets import get_sheets_service, get_cached_tasks
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Rows per page in the test case table preview
+PREVIEW_PAGE_SIZE = 100
+
+@st.fragment
+def render_test_cases_preview(csv_content: str, rows: list):
+    """
+    Render the generated test cases as a paginated table or raw CSV.
+    
+    Runs as a fragment, so switching views or pages reruns only this block
+    rather than the whole page.
+    
+    Args:
+        csv_content: Generated CSV text
+        rows: Rows parsed from the CSV at generation time (may be empty)
+    """
+    # Render only the chosen view; tabs would send both the table and the
+    # full raw CSV to the browser on every rerun
+    view = st.radio(
+        "View",
+        ["📊 Table View", "📝 Raw CSV"],
+        horizontal=True,
+        label_visibility="collapsed"
+    )
+    
+    if view == "📊 Table View" and rows:
+        # Only send one page of rows per rerun; the download button serves
+        # the full CSV
+        page_count = max(1, -(-len(rows) // PREVIEW_PAGE_SIZE))
+        page = 1
+        if page_count > 1:
+            page = st.number_input("Page", min_value=1, max_value=page_count, value=1)
+        start = (page - 1) * PREVIEW_PAGE_SIZE
+        st.dataframe(
+            rows[start:start + PREVIEW_PAGE_SIZE],
+            use_container_width=True,
+            height=400
+        )
+        st.caption(f"📊 {len(rows)} test cases generated")
+    elif view == "📊 Table View":
+        st.code(csv_content[:500] + "..." if len(csv_content) > 500 else csv_content)
+    else:
+        st.code(csv_content, language="csv")
+        st.caption("💡 Use the copy button in the top-right of the code block to copy the CSV")
+
 st.set_page_config(
     page_title="Generate Outputs - FLUX",
     page_icon="⚡",
@@ -22,14 +66,23 @@ st.set_page_config(
 st.title("⚡ Generate Outputs")
 st.markdown("Transform your tasks into professional deliverables with AI.")
 
+# One clock read per rerun keeps timestamps and filenames consistent
+now = datetime.now()
+
 # Tabs for different outputs
 tab1, tab2, tab3 = st.tabs(["📝 Test Cases", "📄 Requirement Doc", "📧 Scrum Email"])
 
-# Load tasks
+# Load tasks. The Gemini SDK is imported inside the generate handlers, so
+# browsing this page never loads or configures it.
 try:
     sheets_service = get_sheets_service()
-    all_tasks = sheets_service.get_all_tasks()
-    done_tasks = [task for task in all_tasks if task.get('Status') == 'Done']
+    all_tasks = get_cached_tasks()
+    
+    # Group by status in one pass; the tabs below pick their buckets from it
+    tasks_by_status = defaultdict(list)
+    for task in all_tasks:
+        tasks_by_status[task.get('Status')].append(task)
+    done_tasks = tasks_by_status['Done']
     
 except Exception as e:
     st.error(f"❌ Failed to load tasks: {str(e)}")
@@ -55,12 +108,14 @@ with tab1:
         if st.button("🚀 Generate Test Cases CSV", type="primary", use_container_width=True):
             with st.spinner("🤖 AI is generating test cases..."):
                 try:
+                    from services.gemini_processor import get_gemini_processor
                     gemini = get_gemini_processor()
-                    csv_content = gemini.generate_test_cases(done_tasks)
+                    csv_content, rows = gemini.generate_test_cases(done_tasks)
                     
                     # Store in session state
                     st.session_state['test_cases_csv'] = csv_content
-                    st.session_state['test_cases_timestamp'] = datetime.now()
+                    st.session_state['test_cases_rows'] = rows
+                    st.session_state['test_cases_timestamp'] = now
                     
                     from utils.toast import success_toast
                     success_toast("Test cases generated successfully!")
@@ -75,48 +130,30 @@ with tab1:
         # Show preview if available
         if 'test_cases_csv' in st.session_state:
             csv_content = st.session_state['test_cases_csv']
-            timestamp = st.session_state.get('test_cases_timestamp', datetime.now())
+            timestamp = st.session_state.get('test_cases_timestamp', now)
             
             st.success(f"✅ Generated on {timestamp.strftime('%Y-%m-%d %H:%M:%S')}")
             
-            # Tabs for different views
-            preview_tab1, preview_tab2 = st.tabs(["📊 Table View", "📝 Raw CSV"])
-            
-            with preview_tab1:
-                # Display as table
-                import pandas as pd
-                from io import StringIO
-                try:
-                    df = pd.read_csv(StringIO(csv_content))
-                    st.dataframe(df, use_container_width=True, height=400)
-                    st.caption(f"📊 {len(df)} test cases generated")
-                except Exception as e:
-                    st.code(csv_content[:500] + "..." if len(csv_content) > 500 else csv_content)
-            
-            with preview_tab2:
-                st.code(csv_content, language="csv")
+            render_test_cases_preview(csv_content, st.session_state.get('test_cases_rows'))
             
             # Action buttons
-            col1, col2, col3 = st.columns(3)
+            col1, col2 = st.columns(2)
             
             with col1:
-                filename = f"test_cases_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+                filename = f"test_cases_{now.strftime('%Y%m%d_%H%M%S')}.csv"
                 st.download_button(
                     label="⬇️ Download CSV",
                     data=csv_content,
                     file_name=filename,
                     mime="text/csv",
-                    use_container_width=True
+                    use_container_width=True,
+                    key="download_tab_csv"
                 )
             
             with col2:
-                if st.button("📋 Copy to Clipboard", use_container_width=True):
-                    st.code(csv_content, language=None)
-                    st.info("👆 Use the copy button in the code block above")
-            
-            with col3:
                 if st.button("🔄 Generate New", use_container_width=True):
                     del st.session_state['test_cases_csv']
+                    st.session_state.pop('test_cases_rows', None)
                     st.rerun()
 
 # TAB 2: Requirement Document
@@ -126,6 +163,7 @@ with tab2:
     
     st.info(f"📊 Found **{len(all_tasks)}** total tasks")
     
+    filtered_tasks = []
     if len(all_tasks) == 0:
         st.warning("⚠️ No tasks found. Upload some evidence first.")
     else:
@@ -136,31 +174,34 @@ with tab2:
             default=["Done"]
         )
         
-        filtered_tasks = [task for task in all_tasks if task.get('Status') in include_filter]
+        filtered_tasks = [task for status in include_filter for task in tasks_by_status.get(status, ())]
         
         st.info(f"Will include **{len(filtered_tasks)}** tasks in the document")
         
         if st.button("🚀 Generate Requirement Document", type="primary", use_container_width=True):
             with st.spinner("🤖 AI is generating requirement document..."):
                 try:
+                    from services.gemini_processor import get_gemini_processor
                     gemini = get_gemini_processor()
-                    markdown_content = gemini.generate_requirement_doc(filtered_tasks)
-                    
-                    st.success("✅ Requirement document generated!")
                     
-                    # Display preview
+                    # Display preview, rendering the document as it streams in
                     st.markdown("### Preview")
-                    with st.expander("View Full Content"):
-                        st.markdown(markdown_content)
+                    with st.expander("View Full Content", expanded=True):
+                        markdown_content = st.write_stream(
+                            gemini.stream_requirement_doc(filtered_tasks)
+                        ).strip()
+                    
+                    st.success("✅ Requirement document generated!")
                     
                     # Download as markdown
-                    filename = f"requirements_{datetime.now().strftime('%Y%m%d')}.md"
+                    filename = f"requirements_{now.strftime('%Y%m%d')}.md"
                     st.download_button(
                         label="⬇️ Download Markdown",
                         data=markdown_content,
                         file_name=filename,
                         mime="text/markdown",
-                        use_container_width=True
+                        use_container_width=True,
+                        key="download_tab_markdown"
                     )
                     
                     # Optional: PDF conversion
@@ -177,33 +218,39 @@ with tab3:
     st.markdown("### Generate Scrum Update Email")
     st.markdown("Creates a professional weekly summary email.")
     
-    # Date range
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        # Default to last Monday
-        today = datetime.now()
-        days_since_monday = today.weekday()
-        last_monday = today - timedelta(days=days_since_monday)
+    # Date range. In a form so picking the start and then the end date
+    # reruns the page once, on submit, instead of after each pick.
+    with st.form("scrum_range"):
+        col1, col2 = st.columns(2)
         
-        week_start = st.date_input(
-            "Week Start",
-            value=last_monday,
-            max_value=today
-        )
-    
-    with col2:
-        week_end = st.date_input(
-            "Week End",
-            value=today,
-            max_value=today
-        )
+        with col1:
+            # Default to last Monday
+            today = now.date()
+            last_monday = today - timedelta(days=today.weekday())
+            
+            week_start = st.date_input(
+                "Week Start",
+                value=last_monday,
+                max_value=today
+            )
+        
+        with col2:
+            week_end = st.date_input(
+                "Week End",
+                value=today,
+                max_value=today
+            )
+        
+        st.form_submit_button("📅 Apply Date Range", use_container_width=True)
     
     # Get tasks in range
+    completed_week_tasks = []
     try:
+        # Filter the task list loaded above instead of fetching the sheet again
         week_tasks = sheets_service.get_tasks_by_date_range(
             datetime.combine(week_start, datetime.min.time()),
-            datetime.combine(week_end, datetime.max.time())
+            datetime.combine(week_end, datetime.max.time()),
+            tasks=all_tasks
         )
         
         completed_week_tasks = [task for task in week_tasks if task.get('Status') == 'Done']
@@ -221,12 +268,19 @@ with tab3:
             if st.button("🚀 Generate Email Draft", type="primary", use_container_width=True):
                 with st.spinner("🤖 AI is drafting your email..."):
                     try:
+                        from services.gemini_processor import get_gemini_processor
                         gemini = get_gemini_processor()
-                        email_content = gemini.generate_scrum_email(
-                            completed_week_tasks,
-                            week_start.strftime('%Y-%m-%d'),
-                            week_end.strftime('%Y-%m-%d')
-                        )
+                        
+                        # Show the draft as it streams in, then swap in the
+                        # editable text area once it is complete
+                        stream_slot = st.empty()
+                        with stream_slot.container():
+                            email_content = st.write_stream(gemini.stream_scrum_email(
+                                completed_week_tasks,
+                                week_start.strftime('%Y-%m-%d'),
+                                week_end.strftime('%Y-%m-%d')
+                            )).strip()
+                        stream_slot.empty()
                         
                         st.success("✅ Email draft generated!")
                         
@@ -253,6 +307,82 @@ with tab3:
     except Exception as e:
         st.error(f"❌ Failed to load tasks: {str(e)}")
 
+# Generate All
+st.divider()
+st.markdown("### 🚀 Generate All")
+st.markdown("Runs every generator that has tasks at once, using the selections in each tab.")
+
+if st.button(
+    "🚀 Generate All Outputs",
+    use_container_width=True,
+    disabled=not (done_tasks or filtered_tasks or completed_week_tasks)
+):
+    with st.spinner("🤖 AI is generating all outputs..."):
+        try:
+            from services.gemini_processor import get_gemini_processor
+            gemini = get_gemini_processor()
+            
+            # Each generator is one Gemini round trip, so running them on
+            # threads makes the wait the slowest call rather than the sum
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                futures = {}
+                if done_tasks:
+                    futures['test_cases'] = executor.submit(gemini.generate_test_cases, done_tasks)
+                if filtered_tasks:
+                    futures['requirement_doc'] = executor.submit(gemini.generate_requirement_doc, filtered_tasks)
+                if completed_week_tasks:
+                    futures['scrum_email'] = executor.submit(
+                        gemini.generate_scrum_email,
+                        completed_week_tasks,
+                        week_start.strftime('%Y-%m-%d'),
+                        week_end.strftime('%Y-%m-%d')
+                    )
+                results = {name: future.result() for name, future in futures.items()}
+            
+            st.success(f"✅ Generated {len(results)} outputs!")
+            
+            if 'test_cases' in results:
+                csv_content, rows = results['test_cases']
+                
+                # Also shown in the Test Cases tab from the next rerun on
+                st.session_state['test_cases_csv'] = csv_content
+                st.session_state['test_cases_rows'] = rows
+                st.session_state['test_cases_timestamp'] = now
+                
+                with st.expander("📝 Test Cases CSV"):
+                    st.code(csv_content, language="csv")
+                st.download_button(
+                    label="⬇️ Download CSV",
+                    data=csv_content,
+                    file_name=f"test_cases_{now.strftime('%Y%m%d_%H%M%S')}.csv",
+                    mime="text/csv",
+                    use_container_width=True,
+                    key="download_all_csv"
+                )
+            
+            if 'requirement_doc' in results:
+                markdown_content = results['requirement_doc']
+                with st.expander("📄 Requirement Document"):
+                    st.markdown(markdown_content)
+                st.download_button(
+                    label="⬇️ Download Markdown",
+                    data=markdown_content,
+                    file_name=f"requirements_{now.strftime('%Y%m%d')}.md",
+                    mime="text/markdown",
+                    use_container_width=True,
+                    key="download_all_markdown"
+                )
+            
+            if 'scrum_email' in results:
+                with st.expander("📧 Scrum Email"):
+                    st.code(results['scrum_email'], language=None)
+            
+            logger.info(f"Generated all outputs: {', '.join(results)}")
+            
+        except Exception as e:
+            st.error(f"❌ Generation failed: {str(e)}")
+            logger.error(f"Generate all error: {str(e)}")
+
 # Info section
 st.divider()
 
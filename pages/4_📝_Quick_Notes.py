@@ -5,13 +5,21 @@ Allows users to quickly save text notes without uploading files.
 
 import streamlit as st
 from datetime import datetime
+from types import MappingProxyType
 
-from services.google_sheets import get_sheets_service
-from services.gemini_processor import get_gemini_processor
+from services.google_sheets import get_sheets_service, get_cached_tasks, clear_task_caches
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Prompt template per enhancement type, filled in with the note on save
+ENHANCEMENT_TEMPLATES = MappingProxyType({
+    "Auto-structure and improve": "Please analyze and improve this note. Make it clearer, better structured, and more professional:\n\n{content}",
+    "Extract action items": "Extract all action items and tasks from this note. Format as a numbered list:\n\n{content}",
+    "Summarize key points": "Summarize the key points from this note in bullet points:\n\n{content}",
+    "Convert to test cases": "Convert this note into test cases with steps and expected results:\n\n{content}"
+})
+
 st.set_page_config(
     page_title="Quick Notes - FLUX",
     page_icon="📝",
@@ -56,12 +64,7 @@ with col2:
     if enhance_with_ai:
         enhancement_type = st.selectbox(
             "Enhancement Type",
-            [
-                "Auto-structure and improve",
-                "Extract action items",
-                "Summarize key points",
-                "Convert to test cases"
-            ]
+            list(ENHANCEMENT_TEMPLATES)
         )
 
 # Save button
@@ -78,19 +81,14 @@ if st.button("💾 Save Note", type="primary", use_container_width=True, disable
             if enhance_with_ai:
                 st.info("🤖 AI is enhancing your note...")
                 
+                # Imported here so browsing notes never loads the Gemini SDK
+                from services.gemini_processor import get_gemini_processor, cached_prompt_response
                 gemini = get_gemini_processor()
                 
-                enhancement_prompts = {
-                    "Auto-structure and improve": f"Please analyze and improve this note. Make it clearer, better structured, and more professional:\n\n{note_content}",
-                    "Extract action items": f"Extract all action items and tasks from this note. Format as a numbered list:\n\n{note_content}",
-                    "Summarize key points": f"Summarize the key points from this note in bullet points:\n\n{note_content}",
-                    "Convert to test cases": f"Convert this note into test cases with steps and expected results:\n\n{note_content}"
-                }
-                
-                prompt = enhancement_prompts.get(enhancement_type, enhancement_prompts["Auto-structure and improve"])
+                template = ENHANCEMENT_TEMPLATES.get(enhancement_type, ENHANCEMENT_TEMPLATES["Auto-structure and improve"])
+                prompt = template.format(content=note_content)
                 
-                response = gemini.model.generate_content(prompt)
-                ai_summary = response.text
+                ai_summary = cached_prompt_response(gemini, prompt)
             
             # Save to Google Sheets
             sheets_service = get_sheets_service()
@@ -106,6 +104,7 @@ if st.button("💾 Save Note", type="primary", use_container_width=True, disable
             }
             
             task_id = sheets_service.create_task(task_data)
+            clear_task_caches()  # Show the new note in cached task lists
             
             st.success("✅ Note saved successfully!")
             
@@ -144,15 +143,19 @@ st.divider()
 st.markdown("### 📋 Recent Notes")
 
 try:
-    sheets_service = get_sheets_service()
-    all_tasks = sheets_service.get_all_tasks()
+    all_tasks = get_cached_tasks()
     
-    # Filter for notes only
-    notes = [task for task in all_tasks if task.get('File Type') == 'note']
+    # Walk back from the newest row and stop at the 5 most recent notes
+    notes = []
+    for task in reversed(all_tasks):
+        if task.get('File Type') == 'note':
+            notes.append(task)
+            if len(notes) == 5:
+                break
     
     if notes:
-        # Show last 5 notes
-        for note in notes[-5:][::-1]:  # Reverse to show newest first
+        # Already newest first
+        for note in notes:
             with st.expander(f"📝 {note.get('Task Name')} - {note.get('Upload Date')}"):
                 col1, col2 = st.columns([3, 1])
                 
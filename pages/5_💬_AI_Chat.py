@@ -3,7 +3,9 @@ AI Chat Page
 Intelligent chat assistant that can discuss tasks and evidence using Gemini.
 """
 
+import gc
 import streamlit as st
+from collections import defaultdict
 from datetime import datetime
 
 from services.google_sheets import get_sheets_service
@@ -59,6 +61,82 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+def stop_streaming():
+    """Keep the partial reply when the user stops a response mid-stream."""
+    # Clicking the button interrupts the running script, so the streaming
+    # loop never sees it; the callback runs first on the next rerun instead
+    partial = st.session_state.pop("streaming_response", "")
+    if partial:
+        st.session_state.chat_messages.append({
+            "role": "assistant",
+            "content": partial + "\n\n*(stopped)*"
+        })
+
+def build_summary(all_tasks: list) -> str:
+    """
+    Build the task overview that is given to the AI as context.
+    
+    Args:
+        all_tasks: List of task dictionaries
+        
+    Returns:
+        Plain-text summary of task counts, examples and recent tasks
+    """
+    # Collect lines and join once at the end rather than growing a string
+    parts = [f"You have {len(all_tasks)} tasks in total.", ""]
+    
+    # Group by status in one pass over the tasks
+    from config import TASK_STATUSES
+    tasks_by_status = defaultdict(list)
+    for task in all_tasks:
+        tasks_by_status[task.get('Status')].append(task)
+    
+    for status in TASK_STATUSES:
+        tasks_in_status = tasks_by_status.get(status)
+        if tasks_in_status:
+            parts.append(f"{status}: {len(tasks_in_status)} tasks")
+            parts.extend(  # Show first 3 of each status
+                f"  - {task.get('Task Name')} ({task.get('File Type')})"
+                for task in tasks_in_status[:3]
+            )
+    
+    # Recent tasks
+    parts.append("")
+    parts.append("Recent tasks:")
+    parts.extend(
+        f"- {task.get('Task Name')}: {task.get('AI Summary', 'No summary')[:100]}..."
+        for task in all_tasks[-5:]
+    )
+    
+    return "\n".join(parts) + "\n"
+
+def fetch_context():
+    """
+    Fetch all tasks and build their AI context summary.
+    
+    Returns:
+        Tuple of (task list, context summary)
+    """
+    all_tasks = get_sheets_service().get_all_tasks()
+    return all_tasks, build_summary(all_tasks)
+
+@st.cache_data(ttl=300, show_spinner=False)
+def load_context(sheet_revision: str):
+    """
+    Cached fetch_context(), keyed on the sheet's modified time.
+    
+    An unchanged sheet is served from cache and any edit forces a fresh read.
+    Callers must not pass None: without a revision there is no way to tell
+    a stale entry from a fresh one, so they call fetch_context() directly.
+    
+    Args:
+        sheet_revision: Sheet modified time, used only as the cache key
+        
+    Returns:
+        Tuple of (task list, context summary)
+    """
+    return fetch_context()
+
 # Initialize chat history in session state
 if "chat_messages" not in st.session_state:
     st.session_state.chat_messages = []
@@ -66,6 +144,10 @@ if "chat_messages" not in st.session_state:
 if "context_loaded" not in st.session_state:
     st.session_state.context_loaded = False
 
+# A partial reply only means something to a Stop click, whose callback has
+# already run by now; anything left over is from an earlier, abandoned stream
+st.session_state.pop("streaming_response", None)
+
 # Load context button
 if not st.session_state.context_loaded:
     st.info("💡 Click 'Load Context' to let the AI access your tasks and evidence for more intelligent responses.")
@@ -73,28 +155,18 @@ if not st.session_state.context_loaded:
     if st.button("🔄 Load Context from Drive & Sheets", type="primary"):
         with st.spinner("Loading your tasks and evidence..."):
             try:
-                sheets_service = get_sheets_service()
-                all_tasks = sheets_service.get_all_tasks()
-                
-                # Build context
-                context_summary = f"You have {len(all_tasks)} tasks in total.\n\n"
-                
-                # Group by status
-                from config import TASK_STATUSES
-                for status in TASK_STATUSES:
-                    tasks_in_status = [t for t in all_tasks if t.get('Status') == status]
-                    if tasks_in_status:
-                        context_summary += f"{status}: {len(tasks_in_status)} tasks\n"
-                        for task in tasks_in_status[:3]:  # Show first 3 of each status
-                            context_summary += f"  - {task.get('Task Name')} ({task.get('File Type')})\n"
-                
-                # Recent tasks
-                context_summary += f"\nRecent tasks:\n"
-                for task in all_tasks[-5:]:
-                    context_summary += f"- {task.get('Task Name')}: {task.get('AI Summary', 'No summary')[:100]}...\n"
+                # Skip the cache when the modified time can't be read rather
+                # than serving whatever was cached under an unknown revision
+                sheet_revision = get_sheets_service().get_last_modified()
+                if sheet_revision:
+                    all_tasks, context_summary = load_context(sheet_revision)
+                else:
+                    all_tasks, context_summary = fetch_context()
                 
                 st.session_state.task_context = context_summary
-                st.session_state.all_tasks = all_tasks
+                # Only the count is kept per session; the task list itself
+                # lives once in the shared load_context cache
+                st.session_state.task_count = len(all_tasks)
                 st.session_state.context_loaded = True
                 
                 st.success("✅ Context loaded! AI can now discuss your tasks intelligently.")
@@ -112,7 +184,9 @@ for message in st.session_state.chat_messages:
         st.markdown(message["content"])
 
 # Chat input
-if prompt := st.chat_input("Ask me about your tasks, evidence, or workflow..."):
+prompt = st.chat_input("Ask me about your tasks, evidence, or workflow...")
+prompt = prompt or st.session_state.pop("pending_prompt", None)
+if prompt:
     # Add user message
     st.session_state.chat_messages.append({"role": "user", "content": prompt})
     
@@ -153,20 +227,18 @@ Note: Suggest they click "Load Context" if they want to discuss their specific t
 
 User question: {prompt}"""
             
-            # Generate response
-            response = gemini.model.generate_content(system_context)
-            full_response = response.text
+            stop_slot = st.empty()
+            stop_slot.button("⏹️ Stop generating", on_click=stop_streaming)
             
-            # Simulate typing effect
-            displayed_text = ""
-            words = full_response.split()
+            # Stream the response, rendering each chunk as it arrives
+            for chunk in gemini.stream_chat(system_context):
+                full_response += chunk
+                st.session_state.streaming_response = full_response
+                message_placeholder.markdown(full_response + "▌")
             
-            for i, word in enumerate(words):
-                displayed_text += word + " "
-                if i % 5 == 0:  # Update every 5 words for smooth animation
-                    message_placeholder.markdown(displayed_text + "▌")
-                    
             # Show final response
+            st.session_state.pop("streaming_response", None)
+            stop_slot.empty()
             message_placeholder.markdown(full_response)
             
             # Save assistant response
@@ -178,6 +250,8 @@ User question: {prompt}"""
             logger.info(f"Chat exchange - User: {prompt[:50]}... | AI: {full_response[:50]}...")
         
         except Exception as e:
+            # The stream is over; a later Stop click must not resurrect it
+            st.session_state.pop("streaming_response", None)
             error_msg = f"❌ Sorry, I encountered an error: {str(e)}\n\nPlease try:\n- Reloading the page\n- Checking your internet connection\n- Verifying your Gemini API key is valid"
             message_placeholder.markdown(error_msg)
             st.session_state.chat_messages.append({
@@ -191,11 +265,15 @@ with st.sidebar:
     st.markdown("### 🎯 Quick Actions")
     
     if st.button("🔄 Reload Context", use_container_width=True):
+        load_context.clear()  # Fetch fresh tasks on the next load
         st.session_state.context_loaded = False
         st.rerun()
     
     if st.button("🗑️ Clear Chat", use_container_width=True):
         st.session_state.chat_messages = []
+        # Post-run GC is off (.streamlit/config.toml), so reclaim the dropped
+        # history here
+        gc.collect()
         st.rerun()
     
     if len(st.session_state.chat_messages) > 0:
@@ -262,10 +340,18 @@ with st.sidebar:
         "List all bugs in progress"
     ]
     
-    for suggestion in suggestions:
-        if st.button(suggestion, key=suggestion, use_container_width=True):
-            # Simulate user asking the question
-            st.session_state.chat_messages.append({"role": "user", "content": suggestion})
+    # One radio + submit instead of eight buttons: picking a question costs
+    # no rerun, asking it costs one
+    with st.form("suggested_questions", border=False):
+        chosen = st.radio(
+            "Suggested questions",
+            suggestions,
+            index=None,
+            label_visibility="collapsed"
+        )
+        if st.form_submit_button("💬 Ask", use_container_width=True) and chosen:
+            # Answered by the chat handler on the next run, as if typed
+            st.session_state.pending_prompt = chosen
             st.rerun()
     
     st.divider()
@@ -273,7 +359,7 @@ with st.sidebar:
     st.markdown("### ℹ️ Context Status")
     if st.session_state.context_loaded:
         st.success("✅ Context loaded")
-        st.metric("Tasks Loaded", len(st.session_state.get("all_tasks", [])))
+        st.metric("Tasks Loaded", st.session_state.get("task_count", 0))
     else:
         st.warning("⚠️ Context not loaded")
         st.info("Load context to enable AI to discuss your specific tasks")
@@ -3,6 +3,9 @@ AI prompt templates for different file types and output generation.
 Implements negative constraints and structured output requirements.
 """
 
+from functools import lru_cache
+from types import MappingProxyType
+
 from config import NEGATIVE_CONSTRAINTS
 
 # Constraint reminder for all prompts
@@ -175,6 +178,17 @@ Body:
 {CONSTRAINTS_REMINDER}
 """
 
+# Analysis prompt per file category (documents are the fallback)
+PROMPT_MAP = MappingProxyType({
+    'video': VIDEO_ANALYSIS_PROMPT,
+    'document': PDF_ANALYSIS_PROMPT,
+    'spreadsheet': SPREADSHEET_ANALYSIS_PROMPT,
+    'image': IMAGE_ANALYSIS_PROMPT
+})
+
+# Longer context notes are almost always unique, so caching them only churns
+_MAX_CACHED_NOTES_LENGTH = 512
+
 def get_prompt_for_file_type(file_category: str, context_notes: str = "") -> str:
     """
     Get the appropriate analysis prompt based on file category.
@@ -186,16 +200,18 @@ def get_prompt_for_file_type(file_category: str, context_notes: str = "") -> str
     Returns:
         Formatted prompt string
     """
-    prompt_map = {
-        'video': VIDEO_ANALYSIS_PROMPT,
-        'document': PDF_ANALYSIS_PROMPT,
-        'spreadsheet': SPREADSHEET_ANALYSIS_PROMPT,
-        'image': IMAGE_ANALYSIS_PROMPT
-    }
-    
-    base_prompt = prompt_map.get(file_category, PDF_ANALYSIS_PROMPT)
+    if len(context_notes) > _MAX_CACHED_NOTES_LENGTH:
+        return _build_prompt(file_category, context_notes)
+    return _cached_prompt(file_category, context_notes)
+
+def _build_prompt(file_category: str, context_notes: str) -> str:
+    """Assemble the analysis prompt (see get_prompt_for_file_type)."""
+    base_prompt = PROMPT_MAP.get(file_category, PDF_ANALYSIS_PROMPT)
     
     if context_notes:
         return f"{base_prompt}\n\nUser Context Notes:\n{context_notes}\n\nNow analyze the file."
     
     return base_prompt
+
+# Reuses the assembled string for repeated (category, short notes) pairs
+_cached_prompt = lru_cache(maxsize=64)(_build_prompt)
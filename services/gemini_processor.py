@@ -3,52 +3,182 @@ Gemini 3.0 Pro integration for multimodal AI processing.
 Handles analysis of videos, PDFs, images, and spreadsheets.
 """
 
+import csv
+import hashlib
+import itertools
 import json
+import re
+import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 import google.generativeai as genai
+from google.api_core.exceptions import GoogleAPICallError, ResourceExhausted
+import streamlit as st
 from PIL import Image
 import io
 
-from config import get_gemini_api_key
+from config import get_gemini_api_keys
 from prompts.templates import get_prompt_for_file_type
 from utils.logger import setup_logger, log_api_call, log_error
 
 logger = setup_logger(__name__)
 
+# orjson parses several times faster; its JSONDecodeError subclasses json's,
+# so the except clauses below cover both parsers
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
+# First JSON object or array in a response, with or without a ```json fence
+_JSON_RE = re.compile(r"(?:```(?:json)?\s*)?(\{.*\}|\[.*\])", re.DOTALL)
+
+# Gemini model used for all calls
+GEMINI_MODEL_NAME = 'gemini-flash-latest'
+
+# Client-side Gemini request budget (free tier allows ~20 requests/minute)
+GEMINI_REQUESTS_PER_MINUTE = 20
+GEMINI_REQUEST_BURST = 5
+
+# Shared pool for running Gemini calls off the Streamlit script thread
+_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="gemini")
+
+# Content digest -> Gemini Files API name, so identical uploads are sent once
+_UPLOAD_CACHE: Dict[str, str] = {}
+_UPLOAD_CACHE_LOCK = threading.Lock()
+_UPLOAD_CACHE_SIZE = 256
+
+# Rows read from an uploaded spreadsheet for analysis
+SPREADSHEET_MAX_ROWS = 1000
+
+# Video processing poll: backoff bounds and overall limit, in seconds
+VIDEO_POLL_INITIAL_DELAY = 0.25
+VIDEO_POLL_MAX_DELAY = 4.0
+VIDEO_PROCESSING_TIMEOUT = 600
+
+class _RateLimiter:
+    """Thread-safe token bucket; acquire() blocks until a request may be sent."""
+    
+    def __init__(self, rate: float, burst: int = 1):
+        """
+        Args:
+            rate: Requests allowed per second on average
+            burst: Requests that may be sent back to back after an idle period
+        """
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """Take one token, sleeping until one is available."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            
+            if self._tokens < 1:
+                # Holding the lock while sleeping keeps waiters in order
+                time.sleep((1 - self._tokens) / self.rate)
+                self._last = time.monotonic()
+                self._tokens = 0.0
+            else:
+                self._tokens -= 1
+
 class GeminiProcessor:
     """Service for processing files with Gemini 3.0 Pro."""
     
     def __init__(self):
         """Initialize Gemini API client."""
         self.model = None
+        self._limiter = _RateLimiter(GEMINI_REQUESTS_PER_MINUTE / 60, burst=GEMINI_REQUEST_BURST)
         self._initialize_client()
     
     def _initialize_client(self):
         """Set up Gemini API client."""
         try:
-            api_key = get_gemini_api_key()
+            self._api_keys = get_gemini_api_keys()
             
-            if not api_key:
+            if not self._api_keys:
                 raise ValueError("GEMINI_API_KEY not found in environment")
             
-            genai.configure(api_key=api_key)
-            
-            # Use gemini-flash-latest (better free tier quota)
-            # Pro model has stricter limits, Flash is faster and has higher quota
-            self.model = genai.GenerativeModel('gemini-flash-latest')
+            self._key_index = 0
+            self._key_lock = threading.Lock()
+            self._configure_key()
             
-            logger.info("Gemini API client initialized with gemini-flash-latest model")
+            logger.info(f"Gemini API client initialized with {GEMINI_MODEL_NAME} model ({len(self._api_keys)} API key(s))")
             
         except Exception as e:
             log_error(logger, e, "Failed to initialize Gemini API")
             raise
     
+    def _configure_key(self):
+        """Point the Gemini SDK at the current API key and rebuild the model."""
+        genai.configure(api_key=self._api_keys[self._key_index])
+        
+        # Use gemini-flash-latest (better free tier quota)
+        # Pro model has stricter limits, Flash is faster and has higher quota
+        self.model = genai.GenerativeModel(GEMINI_MODEL_NAME)
+    
+    def _rotate_key(self, failed_index: int):
+        """
+        Switch to the next API key after a quota error on key failed_index.
+        
+        genai.configure is process-wide, so this also moves file uploads to
+        the new key's project.
+        """
+        with self._key_lock:
+            # Another thread may already have rotated past the failing key
+            if self._key_index != failed_index:
+                return
+            self._key_index = (self._key_index + 1) % len(self._api_keys)
+            self._configure_key()
+            logger.warning(f"Gemini quota exhausted, switched to API key #{self._key_index + 1}")
+    
+    def _generate(self, contents, **kwargs):
+        """
+        Call generate_content after waiting for a rate limit slot.
+        
+        All Gemini generation goes through here so bursts from the pages
+        queue briefly instead of failing with 429s. When several API keys are
+        configured, a quota error switches to the next key and retries, up to
+        once per key. Streamed calls fetch their first chunk here, so a quota
+        error before any text arrives fails over too; errors after that are
+        raised while iterating.
+        
+        Args:
+            contents: Prompt or list of prompt parts
+            **kwargs: Passed through to generate_content (e.g. stream=True)
+            
+        Returns:
+            Gemini response, or an iterator of response chunks when streaming
+        """
+        for attempt in range(len(self._api_keys)):
+            self._limiter.acquire()
+            key_index = self._key_index
+            try:
+                response = self.model.generate_content(contents, **kwargs)
+                if not kwargs.get('stream'):
+                    return response
+                chunks = iter(response)
+                first = next(chunks, None)
+                return iter(()) if first is None else itertools.chain([first], chunks)
+            except ResourceExhausted:
+                if attempt == len(self._api_keys) - 1:
+                    raise
+                self._rotate_key(key_index)
+    
     def process_file(self, file_data, filename: str, file_category: str, context_notes: str = "") -> Dict[str, Any]:
         """
         Process a file using Gemini AI based on its category.
         
+        Results are cached by a hash of the file contents, so re-uploading the
+        same file with the same notes skips the Gemini call. Error results
+        are never cached.
+        
         Args:
             file_data: File data (bytes or file-like object)
             filename: Name of the file
@@ -59,24 +189,15 @@ class GeminiProcessor:
             Analyzed data as dictionary
         """
         try:
-            start_time = datetime.now()
-            
-            # Get appropriate prompt
-            prompt = get_prompt_for_file_type(file_category, context_notes)
-            
-            # Process based on category
-            if file_category == 'video':
-                result = self._process_video(file_data, prompt, filename)
-            elif file_category == 'image':
-                result = self._process_image(file_data, prompt)
-            elif file_category == 'document':
-                result = self._process_document(file_data, prompt, filename)
-            elif file_category == 'spreadsheet':
-                result = self._process_spreadsheet(file_data, prompt, filename)
-            else:
-                result = self._process_generic(file_data, prompt)
+            start_ns = time.perf_counter_ns()
+            
+            # Materialize once so the same bytes can be hashed and processed
+            file_bytes = file_data if isinstance(file_data, bytes) else file_data.read()
+            digest = hashlib.blake2b(file_bytes, digest_size=16).hexdigest()
             
-            duration_ms = (datetime.now() - start_time).total_seconds() * 1000
+            result = cached_file_analysis(self, digest, filename, file_category, context_notes, file_bytes)
+            
+            duration_ms = (time.perf_counter_ns() - start_ns) / 1e6
             log_api_call(logger, "Gemini", f"process_{file_category}: {filename}", duration_ms)
             
             return result
@@ -90,36 +211,61 @@ class GeminiProcessor:
                 "error": True
             }
     
-    def _process_video(self, file_data, prompt: str, filename: str) -> Dict[str, Any]:
+    def process_file_async(self, file_data, filename: str, file_category: str, context_notes: str = "") -> Future:
+        """
+        Start process_file on the shared Gemini worker pool.
+        
+        Args:
+            file_data: File data (bytes or file-like object)
+            filename: Name of the file
+            file_category: Category ('video', 'document', 'spreadsheet', 'image')
+            context_notes: Additional context from user
+            
+        Returns:
+            Future resolving to the process_file result
+        """
+        return _EXECUTOR.submit(self.process_file, file_data, filename, file_category, context_notes)
+    
+    def _analyze_file(self, file_bytes: bytes, digest: str, filename: str, file_category: str,
+                      context_notes: str) -> Dict[str, Any]:
+        """Run the Gemini analysis for a file; raises on failure (see process_file)."""
+        # Get appropriate prompt
+        prompt = get_prompt_for_file_type(file_category, context_notes)
+        
+        # Process based on category
+        if file_category == 'video':
+            return self._process_video(file_bytes, digest, prompt, filename)
+        elif file_category == 'image':
+            return self._process_image(file_bytes, prompt)
+        elif file_category == 'document':
+            return self._process_document(file_bytes, digest, prompt, filename)
+        elif file_category == 'spreadsheet':
+            return self._process_spreadsheet(file_bytes, prompt, filename)
+        else:
+            return self._process_generic(file_bytes, prompt)
+    
+    def _process_video(self, file_bytes: bytes, digest: str, prompt: str, filename: str) -> Dict[str, Any]:
         """Process video file with Gemini."""
         try:
             # For video, we need to upload the file first
             # Note: Gemini API has specific requirements for video uploads
             
-            # Save to temp file (Gemini API requires file path for videos)
-            import tempfile
+            # Upload video to Gemini (the API requires a file path for videos)
+            video_file = self._upload_via_temp_file(file_bytes, digest, '.mp4')
             
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.mp4') as temp_file:
-                if isinstance(file_data, bytes):
-                    temp_file.write(file_data)
-                else:
-                    temp_file.write(file_data.read())
-                temp_path = temp_file.name
-            
-            # Upload video to Gemini
-            video_file = genai.upload_file(path=temp_path)
-            
-            # Wait for processing
+            # Wait for processing, polling quickly at first (short clips are
+            # usually ready within a second) and backing off for long ones
+            delay = VIDEO_POLL_INITIAL_DELAY
+            deadline = time.monotonic() + VIDEO_PROCESSING_TIMEOUT
             while video_file.state.name == "PROCESSING":
-                time.sleep(2)
+                if time.monotonic() >= deadline:
+                    raise TimeoutError(f"Gemini video processing timed out: {filename}")
+                time.sleep(delay)
+                delay = min(delay * 1.6, VIDEO_POLL_MAX_DELAY)
                 video_file = genai.get_file(video_file.name)
             
             # Generate content
-            response = self.model.generate_content([video_file, prompt])
-            
-            # Clean up temp file
-            import os
-            os.unlink(temp_path)
+            response = self._generate([video_file, prompt])
             
             return self._parse_json_response(response.text)
             
@@ -127,6 +273,66 @@ class GeminiProcessor:
             log_error(logger, e, "Failed to process video")
             raise
     
+    def _upload_via_temp_file(self, file_bytes: bytes, digest: str, suffix: str):
+        """
+        Upload file bytes to the Gemini Files API through a temporary file.
+        
+        The temp file is removed even if the upload fails. Contents already
+        uploaded in this process are reused from the Files API (files live
+        there for ~48h) instead of being sent again.
+        
+        Args:
+            file_bytes: File contents
+            digest: Content digest computed by process_file
+            suffix: Temp file extension, which Gemini uses to infer the MIME type
+            
+        Returns:
+            Uploaded Gemini file handle
+        """
+        import os
+        import tempfile
+        
+        existing = self._get_uploaded_file(digest)
+        if existing is not None:
+            return existing
+        
+        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as temp_file:
+            temp_path = temp_file.name
+            temp_file.write(file_bytes)
+        
+        try:
+            uploaded = genai.upload_file(path=temp_path)
+        finally:
+            os.unlink(temp_path)
+        
+        with _UPLOAD_CACHE_LOCK:
+            _UPLOAD_CACHE[digest] = uploaded.name
+            if len(_UPLOAD_CACHE) > _UPLOAD_CACHE_SIZE:
+                del _UPLOAD_CACHE[next(iter(_UPLOAD_CACHE))]  # Oldest first
+        
+        return uploaded
+    
+    def _get_uploaded_file(self, digest: str):
+        """Return the still-usable Gemini file previously uploaded for digest, or None."""
+        with _UPLOAD_CACHE_LOCK:
+            name = _UPLOAD_CACHE.get(digest)
+        if name is None:
+            return None
+        
+        try:
+            uploaded = genai.get_file(name)
+        except GoogleAPICallError:
+            # Expired, deleted, or owned by another API key's project
+            uploaded = None
+        
+        if uploaded is None or uploaded.state.name == "FAILED":
+            with _UPLOAD_CACHE_LOCK:
+                _UPLOAD_CACHE.pop(digest, None)
+            return None
+        
+        logger.info(f"Reusing uploaded Gemini file: {name}")
+        return uploaded
+    
     def _process_image(self, file_data, prompt: str) -> Dict[str, Any]:
         """Process image file with Gemini."""
         try:
@@ -137,7 +343,7 @@ class GeminiProcessor:
                 image = Image.open(file_data)
             
             # Generate content with image
-            response = self.model.generate_content([prompt, image])
+            response = self._generate([prompt, image])
             
             return self._parse_json_response(response.text)
             
@@ -145,28 +351,14 @@ class GeminiProcessor:
             log_error(logger, e, "Failed to process image")
             raise
     
-    def _process_document(self, file_data, prompt: str, filename: str) -> Dict[str, Any]:
+    def _process_document(self, file_bytes: bytes, digest: str, prompt: str, filename: str) -> Dict[str, Any]:
         """Process PDF document with Gemini."""
         try:
             # For PDFs, we need to upload the file
-            import tempfile
-            
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as temp_file:
-                if isinstance(file_data, bytes):
-                    temp_file.write(file_data)
-                else:
-                    temp_file.write(file_data.read())
-                temp_path = temp_file.name
-            
-            # Upload document
-            doc_file = genai.upload_file(path=temp_path)
+            doc_file = self._upload_via_temp_file(file_bytes, digest, '.pdf')
             
             # Generate content
-            response = self.model.generate_content([doc_file, prompt])
-            
-            # Clean up
-            import os
-            os.unlink(temp_path)
+            response = self._generate([doc_file, prompt])
             
             return self._parse_json_response(response.text)
             
@@ -183,24 +375,39 @@ class GeminiProcessor:
             if isinstance(file_data, bytes):
                 file_data = io.BytesIO(file_data)
             
-            # Determine file type
+            # Determine file type. Only the first SPREADSHEET_MAX_ROWS rows are
+            # read; the prompt only ever shows a sample.
             if filename.endswith('.csv'):
-                df = pd.read_csv(file_data)
+                df = pd.read_csv(file_data, nrows=SPREADSHEET_MAX_ROWS)
             else:
-                df = pd.read_excel(file_data)
+                df = pd.read_excel(file_data, nrows=SPREADSHEET_MAX_ROWS)
+            
+            # Column types and distinct counts tell Gemini more per token
+            # than a wide to_string() dump
+            dtypes = df.dtypes.astype(str).to_dict()
+            distinct = df.nunique(dropna=True).to_dict()
+            
+            row_count = f"{len(df)}+" if len(df) >= SPREADSHEET_MAX_ROWS else str(len(df))
             
             # Convert to text representation
-            data_summary = f"Spreadsheet Data:\n\n"
-            data_summary += f"Columns: {', '.join(df.columns.tolist())}\n"
-            data_summary += f"Total Rows: {len(df)}\n\n"
-            data_summary += f"First 10 rows:\n{df.head(10).to_string()}\n\n"
+            parts = [
+                "Spreadsheet Data:",
+                "",
+                f"Total Rows: {row_count}",
+                "Columns (type, distinct values):",
+                *(f"- {col}: {dtypes[col]}, {distinct[col]}" for col in df.columns),
+                "",
+                f"First 10 rows (CSV):\n{df.head(10).to_csv(index=False)}"
+            ]
             
             if len(df) > 10:
-                data_summary += f"Last 5 rows:\n{df.tail(5).to_string()}"
+                parts.append(f"Last 5 rows (CSV):\n{df.tail(5).to_csv(index=False)}")
+            
+            data_summary = "\n".join(parts)
             
             # Generate content
             full_prompt = f"{prompt}\n\n{data_summary}"
-            response = self.model.generate_content(full_prompt)
+            response = self._generate(full_prompt)
             
             return self._parse_json_response(response.text)
             
@@ -212,7 +419,7 @@ class GeminiProcessor:
         """Generic file processing fallback."""
         try:
             # Just send the prompt
-            response = self.model.generate_content(prompt)
+            response = self._generate(prompt)
             return self._parse_json_response(response.text)
             
         except Exception as e:
@@ -222,22 +429,16 @@ class GeminiProcessor:
     def _parse_json_response(self, response_text: str) -> Dict[str, Any]:
         """
         Parse JSON from Gemini response.
-        Handles cases where response includes markdown code blocks.
+        Handles cases where the JSON is wrapped in markdown code blocks or prose.
         """
         try:
-            # Remove markdown code blocks if present
-            text = response_text.strip()
-            if text.startswith('```json'):
-                text = text[7:]  # Remove ```json
-            if text.startswith('```'):
-                text = text[3:]  # Remove ```
-            if text.endswith('```'):
-                text = text[:-3]  # Remove trailing ```
-            
-            text = text.strip()
+            # Pull out the JSON object/array, skipping any code fence or prose
+            match = _JSON_RE.search(response_text)
+            if not match:
+                raise json.JSONDecodeError("No JSON found in response", response_text, 0)
             
             # Parse JSON
-            result = json.loads(text)
+            result = _json_loads(match.group(1))
             return result
             
         except json.JSONDecodeError:
@@ -249,7 +450,27 @@ class GeminiProcessor:
                 "raw_response": True
             }
     
-    def generate_test_cases(self, tasks: list) -> str:
+    def _stream_text(self, response) -> Iterator[str]:
+        """Yield the text of each chunk of a streamed response."""
+        for chunk in response:
+            # The final chunk can carry only finish metadata and no text
+            if chunk.parts:
+                yield chunk.text
+    
+    def stream_chat(self, prompt: str) -> Iterator[str]:
+        """
+        Stream a chat reply as Gemini writes it.
+        
+        Args:
+            prompt: Full prompt including any task context
+            
+        Yields:
+            Reply text chunks
+        """
+        response = self._generate(prompt, stream=True)
+        yield from self._stream_text(response)
+    
+    def generate_test_cases(self, tasks: list) -> Tuple[str, List[Dict[str, str]]]:
         """
         Generate TestRail-compatible CSV from completed tasks.
         
@@ -257,28 +478,39 @@ class GeminiProcessor:
             tasks: List of completed task dictionaries
             
         Returns:
-            CSV content as string
+            Tuple of (CSV content as string, parsed rows as dictionaries).
+            Rows are empty if the CSV could not be parsed.
         """
         try:
             from prompts.templates import TEST_CASE_GENERATION_PROMPT
             
             # Build context from tasks
+            # get is bound once per task (walrus in the first field) instead of
+            # looking up task.get for every field
             tasks_context = "\n\n".join([
-                f"Task {i+1}: {task.get('Task Name', 'Untitled')}\n"
-                f"Summary: {task.get('AI Summary', 'No summary')}\n"
-                f"Evidence: {task.get('Evidence Link', 'N/A')}"
+                f"Task {i+1}: {(get := task.get)('Task Name', 'Untitled')}\n"
+                f"Summary: {get('AI Summary', 'No summary')}\n"
+                f"Evidence: {get('Evidence Link', 'N/A')}"
                 for i, task in enumerate(tasks)
             ])
             
             full_prompt = f"{TEST_CASE_GENERATION_PROMPT}\n\nTasks:\n{tasks_context}"
             
-            response = self.model.generate_content(full_prompt)
+            response_text = cached_prompt_response(self, full_prompt)
             
-            return response.text.strip()
+            csv_content = response_text.strip()
+            
+            # Parse once here so the preview never has to re-tokenize the CSV
+            try:
+                rows = list(csv.DictReader(io.StringIO(csv_content)))
+            except csv.Error:
+                rows = []
+            
+            return csv_content, rows
             
         except Exception as e:
             log_error(logger, e, "Failed to generate test cases")
-            return "Error generating test cases"
+            return "Error generating test cases", []
     
     def generate_requirement_doc(self, tasks: list) -> str:
         """
@@ -293,26 +525,49 @@ class GeminiProcessor:
         try:
             from prompts.templates import REQUIREMENT_DOCUMENT_PROMPT
             
-            # Build context from tasks
-            tasks_context = "\n\n".join([
-                f"### Task {i+1}: {task.get('Task Name', 'Untitled')}\n"
-                f"**Date:** {task.get('Upload Date', 'N/A')}\n"
-                f"**Type:** {task.get('File Type', 'N/A')}\n"
-                f"**Summary:** {task.get('AI Summary', 'No summary')}\n"
-                f"**Evidence:** [{task.get('Evidence Link', 'N/A')}]({task.get('Evidence Link', '#')})"
-                for i, task in enumerate(tasks)
-            ])
-            
-            full_prompt = f"{REQUIREMENT_DOCUMENT_PROMPT}\n\nTasks:\n{tasks_context}"
+            full_prompt = f"{REQUIREMENT_DOCUMENT_PROMPT}\n\n{self._requirement_doc_context(tasks)}"
             
-            response = self.model.generate_content(full_prompt)
+            response_text = cached_prompt_response(self, full_prompt)
             
-            return response.text.strip()
+            return response_text.strip()
             
         except Exception as e:
             log_error(logger, e, "Failed to generate requirement document")
             return "# Error\n\nFailed to generate requirement document"
     
+    def stream_requirement_doc(self, tasks: list) -> Iterator[str]:
+        """
+        Stream requirement document content as Gemini writes it.
+        
+        Same prompt as generate_requirement_doc, but not served from the
+        response cache. Errors are raised to the caller.
+        
+        Args:
+            tasks: List of task dictionaries
+            
+        Yields:
+            Markdown text chunks
+        """
+        from prompts.templates import REQUIREMENT_DOCUMENT_PROMPT
+        
+        full_prompt = f"{REQUIREMENT_DOCUMENT_PROMPT}\n\n{self._requirement_doc_context(tasks)}"
+        
+        response = self._generate(full_prompt, stream=True)
+        yield from self._stream_text(response)
+    
+    def _requirement_doc_context(self, tasks: list) -> str:
+        """Build the task context block for the requirement document prompt."""
+        # get is bound once per task (walrus in the first field)
+        tasks_context = "\n\n".join([
+            f"### Task {i+1}: {(get := task.get)('Task Name', 'Untitled')}\n"
+            f"**Date:** {get('Upload Date', 'N/A')}\n"
+            f"**Type:** {get('File Type', 'N/A')}\n"
+            f"**Summary:** {get('AI Summary', 'No summary')}\n"
+            f"**Evidence:** [{get('Evidence Link', 'N/A')}]({get('Evidence Link', '#')})"
+            for i, task in enumerate(tasks)
+        ])
+        return f"Tasks:\n{tasks_context}"
+    
     def generate_scrum_email(self, tasks: list, week_start: str, week_end: str) -> str:
         """
         Generate Scrum update email from completed tasks.
@@ -328,30 +583,86 @@ class GeminiProcessor:
         try:
             from prompts.templates import EMAIL_DRAFT_PROMPT
             
-            # Build context
-            tasks_context = "\n".join([
-                f"- {task.get('Task Name', 'Untitled')} [{task.get('File Type', 'N/A')}]"
-                for task in tasks
-            ])
-            
-            full_prompt = f"{EMAIL_DRAFT_PROMPT}\n\n"
-            full_prompt += f"Week: {week_start} to {week_end}\n"
-            full_prompt += f"Completed Tasks ({len(tasks)}):\n{tasks_context}"
+            full_prompt = f"{EMAIL_DRAFT_PROMPT}\n\n{self._scrum_email_context(tasks, week_start, week_end)}"
             
-            response = self.model.generate_content(full_prompt)
+            response_text = cached_prompt_response(self, full_prompt)
             
-            return response.text.strip()
+            return response_text.strip()
             
         except Exception as e:
             log_error(logger, e, "Failed to generate email")
             return "Error generating email draft"
+    
+    def stream_scrum_email(self, tasks: list, week_start: str, week_end: str) -> Iterator[str]:
+        """
+        Stream a Scrum update email as Gemini writes it.
+        
+        Same prompt as generate_scrum_email, but not served from the response
+        cache. Errors are raised to the caller.
+        
+        Args:
+            tasks: List of completed task dictionaries
+            week_start: Start date of the week
+            week_end: End date of the week
+            
+        Yields:
+            Email text chunks
+        """
+        from prompts.templates import EMAIL_DRAFT_PROMPT
+        
+        full_prompt = f"{EMAIL_DRAFT_PROMPT}\n\n{self._scrum_email_context(tasks, week_start, week_end)}"
+        
+        response = self._generate(full_prompt, stream=True)
+        yield from self._stream_text(response)
+    
+    def _scrum_email_context(self, tasks: list, week_start: str, week_end: str) -> str:
+        """Build the week and task context block for the Scrum email prompt."""
+        # get is bound once per task (walrus in the first field)
+        tasks_context = "\n".join([
+            f"- {(get := task.get)('Task Name', 'Untitled')} [{get('File Type', 'N/A')}]"
+            for task in tasks
+        ])
+        
+        email_context = f"Week: {week_start} to {week_end}\n"
+        email_context += f"Completed Tasks ({len(tasks)}):\n{tasks_context}"
+        return email_context
 
-# Singleton instance
-_gemini_processor = None
+def wait_future(future: Future, poll: float = 0.1, on_poll=None):
+    """
+    Wait for a future by polling it from the Streamlit script thread.
+    
+    Args:
+        future: Future to wait for
+        poll: Seconds between checks
+        on_poll: Optional callable run on each check, e.g. to update a progress
+            widget (widgets can only be updated from the script thread)
+        
+    Returns:
+        The future's result (re-raises its exception)
+    """
+    while not future.done():
+        if on_poll:
+            on_poll()
+        time.sleep(poll)
+    return future.result()
 
+# Singleton instance with caching
+@st.cache_resource
 def get_gemini_processor() -> GeminiProcessor:
-    """Get or create Gemini processor instance."""
-    global _gemini_processor
-    if _gemini_processor is None:
-        _gemini_processor = GeminiProcessor()
-    return _gemini_processor
+    """Get or create cached Gemini processor instance."""
+    return GeminiProcessor()
+
+# Keyed by content digest plus everything that shapes the prompt; the raw bytes
+# are passed unhashed. Failed analyses raise and are never cached.
+@st.cache_data(show_spinner=False, max_entries=256)
+def cached_file_analysis(_processor: GeminiProcessor, digest: str, filename: str, file_category: str,
+                         context_notes: str, _file_bytes: bytes) -> Dict[str, Any]:
+    """Get cached Gemini analysis for a file's contents (see process_file)."""
+    return _processor._analyze_file(_file_bytes, digest, filename, file_category, context_notes)
+
+# Identical inputs are common with Streamlit reruns, so keep responses for an
+# hour. Failed calls raise and are never cached.
+@st.cache_data(ttl=3600, show_spinner=False)
+def cached_prompt_response(_processor: GeminiProcessor, prompt: str) -> str:
+    """Get cached response text for a single prompt."""
+    return _processor._generate(prompt).text
@@ -4,16 +4,75 @@ Handles uploads, folder organization, and WebViewLink generation.
 """
 
 import io
-import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
 from datetime import datetime
+import httplib2
+import streamlit as st
+from google_auth_httplib2 import AuthorizedHttp
 from googleapiclient.discovery import build
-from googleapiclient.http import MediaIoBaseUpload
-from google.oauth2 import service_account
+from googleapiclient.http import HttpRequest, MediaInMemoryUpload, MediaIoBaseUpload
 from utils.logger import setup_logger, log_api_call, log_error
-from config import get_service_account_path, get_drive_folder_id
+from config import load_service_account_credentials, get_drive_folder_id, DRIVE_UPLOAD_CHUNK_SIZE, DRIVE_RESUMABLE_THRESHOLD
 
 logger = setup_logger(__name__)
 
+# Resolved (parent_id, folder_name) -> folder ID entries kept per process
+FOLDER_CACHE_SIZE = 1024
+
+# Idle keep-alive connections kept for reuse by any thread
+DRIVE_HTTP_POOL_SIZE = 8
+
+class _HttpPool:
+    """
+    Pool of authorized httplib2 connections shared by all threads.
+    
+    httplib2.Http isn't thread-safe, so each request checks a connection out
+    for its duration. Connections outlive the short-lived threads that use
+    them (script runs, per-upload executors), keeping TLS sessions warm.
+    """
+    
+    def __init__(self, credentials, size: int = DRIVE_HTTP_POOL_SIZE):
+        self._credentials = credentials
+        self._idle = queue.LifoQueue(maxsize=size)  # LIFO reuses the warmest connection
+    
+    @contextmanager
+    def connection(self):
+        """Check out an idle connection (or open one) and return it afterwards."""
+        try:
+            http = self._idle.get_nowait()
+        except queue.Empty:
+            http = AuthorizedHttp(self._credentials, http=httplib2.Http())
+        try:
+            yield http
+        finally:
+            try:
+                self._idle.put_nowait(http)
+            except queue.Full:
+                http.close()
+
+class _PooledHttpRequest(HttpRequest):
+    """HttpRequest that runs on a connection checked out from an _HttpPool."""
+    
+    def __init__(self, pool: _HttpPool, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._pool = pool
+    
+    def execute(self, http=None, num_retries=0):
+        if http is not None:
+            return super().execute(http=http, num_retries=num_retries)
+        with self._pool.connection() as pooled:
+            return super().execute(http=pooled, num_retries=num_retries)
+    
+    def next_chunk(self, http=None, num_retries=0):
+        if http is not None:
+            return super().next_chunk(http=http, num_retries=num_retries)
+        with self._pool.connection() as pooled:
+            return super().next_chunk(http=pooled, num_retries=num_retries)
+
 class GoogleDriveService:
     """Service for interacting with Google Drive API."""
     
@@ -21,27 +80,25 @@ class GoogleDriveService:
         """Initialize Google Drive service with credentials."""
         self.service = None
         self.root_folder_id = get_drive_folder_id()
+        self._folder_cache = OrderedDict()  # (parent_id, folder_name) -> folder ID, LRU order
+        self._folder_cache_lock = threading.Lock()
         self._initialize_service()
     
     def _initialize_service(self):
         """Set up Google Drive API service."""
         try:
-            service_account_path = get_service_account_path()
+            # Shared, cached credentials (also used by the Sheets service)
+            credentials = load_service_account_credentials()
             
-            if not os.path.exists(service_account_path):
-                raise FileNotFoundError(f"Service account file not found: {service_account_path}")
+            # Build Drive service. Requests run on connections borrowed from a
+            # pool owned by this (cached) service, so keep-alive connections are
+            # reused across threads and script runs.
+            self._http_pool = _HttpPool(credentials)
             
-            # Define required scopes
-            SCOPES = ['https://www.googleapis.com/auth/drive.file']
-            
-            # Load credentials
-            credentials = service_account.Credentials.from_service_account_file(
-                service_account_path,
-                scopes=SCOPES
-            )
+            def build_request(http, *args, **kwargs):
+                return _PooledHttpRequest(self._http_pool, http, *args, **kwargs)
             
-            # Build Drive service
-            self.service = build('drive', 'v3', credentials=credentials)
+            self.service = build('drive', 'v3', credentials=credentials, requestBuilder=build_request)
             logger.info("Google Drive service initialized successfully")
             
         except Exception as e:
@@ -81,46 +138,77 @@ class GoogleDriveService:
             log_error(logger, e, f"Failed to create folder: {folder_name}")
             raise
     
-    def upload_file(self, file_data, filename: str, mime_type: str, folder_id: str = None) -> dict:
+    def upload_file(self, file_data, filename: str, mime_type: str, folder_id: str = None,
+                    progress_callback=None) -> dict:
         """
         Upload a file to Google Drive.
         
+        Files of DRIVE_RESUMABLE_THRESHOLD or more are streamed in fixed-size
+        chunks via a resumable upload, so file-like objects are never buffered
+        in memory as a whole. Smaller files are sent in a single request,
+        skipping the resumable session round trip.
+        
         Args:
             file_data: File data (bytes or file-like object)
             filename: Name of the file
             mime_type: MIME type of the file
             folder_id: ID of folder to upload to (uses root if None)
+            progress_callback: Optional callable receiving upload progress (0.0-1.0)
             
         Returns:
             Dictionary with file metadata including webViewLink
         """
         try:
-            start_time = datetime.now()
+            start_ns = time.perf_counter_ns()
             parent_id = folder_id or self.root_folder_id
             
-            # Convert bytes to file-like object if needed
-            if isinstance(file_data, bytes):
-                file_data = io.BytesIO(file_data)
-            
             file_metadata = {
                 'name': filename,
                 'parents': [parent_id]
             }
             
-            media = MediaIoBaseUpload(
-                file_data,
-                mimetype=mime_type,
-                resumable=True
-            )
+            if isinstance(file_data, (bytes, bytearray)):
+                # In-memory payloads are uploaded from the buffer as-is
+                resumable = len(file_data) >= DRIVE_RESUMABLE_THRESHOLD
+                media = MediaInMemoryUpload(
+                    file_data,
+                    mimetype=mime_type,
+                    chunksize=DRIVE_UPLOAD_CHUNK_SIZE,
+                    resumable=resumable
+                )
+            else:
+                # File-likes (e.g. Streamlit's UploadedFile) are read in place
+                size = _remaining_size(file_data)
+                resumable = size is None or size >= DRIVE_RESUMABLE_THRESHOLD
+                media = MediaIoBaseUpload(
+                    file_data,
+                    mimetype=mime_type,
+                    chunksize=DRIVE_UPLOAD_CHUNK_SIZE,
+                    resumable=resumable
+                )
             
-            file = self.service.files().create(
+            # Request webViewLink in the create response itself so no
+            # follow-up files().get round trip is needed for the link
+            request = self.service.files().create(
                 body=file_metadata,
                 media_body=media,
                 fields='id, name, webViewLink, size, createdTime',
                 supportsAllDrives=True
-            ).execute()
+            )
             
-            duration_ms = (datetime.now() - start_time).total_seconds() * 1000
+            if resumable:
+                # Send the file chunk by chunk, reporting progress as we go
+                file = None
+                while file is None:
+                    status, file = request.next_chunk()
+                    if status and progress_callback:
+                        progress_callback(status.progress())
+            else:
+                file = request.execute()
+                if progress_callback:
+                    progress_callback(1.0)
+            
+            duration_ms = (time.perf_counter_ns() - start_ns) / 1e6
             log_api_call(logger, "Google Drive", f"upload_file: {filename}", duration_ms)
             
             return {
@@ -133,79 +221,140 @@ class GoogleDriveService:
             
         except Exception as e:
             log_error(logger, e, f"Failed to upload file: {filename}")
+            if folder_id:
+                # The target may be a cached folder that no longer exists
+                self._clear_folder_cache()
             raise
     
-    def organize_by_date(self, file_category: str) -> str:
+    def organize_by_date(self, file_category: str, when: datetime = None) -> str:
         """
         Get or create a dated folder structure for organizing uploads.
         Structure: root/YYYY/MM/category/
         
         Args:
             file_category: Category of file (video, document, etc.)
+            when: Timestamp to file the upload under (defaults to now)
             
         Returns:
             ID of the target folder
         """
         try:
-            now = datetime.now()
-            year = now.strftime('%Y')
-            month = now.strftime('%m')
-            
-            # Create/get year folder
-            year_folder_id = self._get_or_create_folder(year, self.root_folder_id)
+            now = when or datetime.now()
+            year = f"{now.year:04d}"
+            month = f"{now.month:02d}"
             
-            # Create/get month folder
-            month_folder_id = self._get_or_create_folder(month, year_folder_id)
-            
-            # Create/get category folder
-            category_folder_id = self._get_or_create_folder(file_category, month_folder_id)
-            
-            return category_folder_id
+            # Resolve year/month/category with one lookup, creating whatever is missing
+            return self._get_or_create_folder_path([year, month, file_category], self.root_folder_id)
             
         except Exception as e:
             log_error(logger, e, "Failed to organize by date")
+            self._clear_folder_cache()
             return self.root_folder_id  # Fallback to root
     
-    def _get_or_create_folder(self, folder_name: str, parent_id: str) -> str:
+    def _get_or_create_folder_path(self, folder_names: list, parent_id: str) -> str:
         """
-        Get existing folder ID or create if it doesn't exist.
+        Get or create a nested folder path, e.g. ["2024", "05", "video"].
+        
+        Every folder on the path is looked up in a single files.list request
+        (folders with any of the names, with their parents), and the chain is
+        then walked locally. Only the missing folders cost extra requests.
         
         Args:
-            folder_name: Name of folder
-            parent_id: Parent folder ID
+            folder_names: Folder names from outermost to innermost
+            parent_id: ID of the folder the path starts in
             
         Returns:
-            Folder ID
+            ID of the innermost folder
         """
         try:
-            # Search for existing folder
-            query = f"name='{folder_name}' and '{parent_id}' in parents and mimeType='application/vnd.google-apps.folder' and trashed=false"
-            
-            results = self.service.files().list(
-                q=query,
-                fields='files(id, name)',
-                pageSize=1,
-                supportsAllDrives=True,
-                includeItemsFromAllDrives=True
-            ).execute()
+            # Walk as much of the path as is already cached
+            remaining = list(folder_names)
+            while remaining:
+                folder_id = self._get_cached_folder(parent_id, remaining[0])
+                if folder_id is None:
+                    break
+                parent_id = folder_id
+                remaining.pop(0)
+            if not remaining:
+                return parent_id
+            folder_names = remaining
             
-            files = results.get('files', [])
+            names_clause = " or ".join(f"name='{_escape_drive_query(name)}'" for name in set(folder_names))
+            query = f"({names_clause}) and mimeType='application/vnd.google-apps.folder' and trashed=false"
             
-            if files:
-                return files[0]['id']
-            else:
-                return self.create_folder(folder_name, parent_id)
+            # (parent_id, name) -> folder ID for every candidate folder
+            found = {}
+            page_token = None
+            while True:
+                results = self.service.files().list(
+                    q=query,
+                    fields='nextPageToken, files(id, name, parents)',
+                    pageSize=1000,
+                    pageToken=page_token,
+                    spaces='drive',
+                    supportsAllDrives=True,
+                    includeItemsFromAllDrives=True
+                ).execute()
+                
+                for folder in results.get('files', []):
+                    for parent in folder.get('parents', []):
+                        found.setdefault((parent, folder['name']), folder['id'])
                 
+                page_token = results.get('nextPageToken')
+                if not page_token:
+                    break
+            
+            for folder_name in folder_names:
+                folder_id = found.get((parent_id, folder_name)) or self.create_folder(folder_name, parent_id)
+                self._cache_folder(parent_id, folder_name, folder_id)
+                parent_id = folder_id
+            
+            return parent_id
+            
         except Exception as e:
-            log_error(logger, e, f"Failed to get or create folder: {folder_name}")
+            log_error(logger, e, f"Failed to get or create folder path: {'/'.join(folder_names)}")
             raise
+    
+    def _get_cached_folder(self, parent_id: str, folder_name: str):
+        """Return the cached folder ID for (parent_id, folder_name), or None."""
+        key = (parent_id, folder_name)
+        with self._folder_cache_lock:
+            folder_id = self._folder_cache.get(key)
+            if folder_id is not None:
+                self._folder_cache.move_to_end(key)
+            return folder_id
+    
+    def _cache_folder(self, parent_id: str, folder_name: str, folder_id: str):
+        """Remember a resolved folder ID, evicting the least recently used entry when full."""
+        with self._folder_cache_lock:
+            self._folder_cache[(parent_id, folder_name)] = folder_id
+            self._folder_cache.move_to_end((parent_id, folder_name))
+            if len(self._folder_cache) > FOLDER_CACHE_SIZE:
+                self._folder_cache.popitem(last=False)
+    
+    def _clear_folder_cache(self):
+        """Forget all resolved folder IDs (e.g. after a cached folder was deleted)."""
+        with self._folder_cache_lock:
+            self._folder_cache.clear()
+
+def _escape_drive_query(value: str) -> str:
+    """Escape a value for use inside a single-quoted Drive query string."""
+    return value.replace('\\', '\\\\').replace("'", "\\'")
 
-# Singleton instance
-_drive_service = None
+def _remaining_size(file_data):
+    """Return the number of bytes left to read from a file-like object, or None if unknown."""
+    # Seek to the end and back rather than reading the buffer: getbuffer() on
+    # an UploadedFile's BytesIO would copy the whole upload
+    try:
+        position = file_data.tell()
+        end = file_data.seek(0, io.SEEK_END)
+        file_data.seek(position)
+        return end - position
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return None
 
+# Singleton instance with caching
+@st.cache_resource
 def get_drive_service() -> GoogleDriveService:
-    """Get or create Google Drive service instance."""
-    global _drive_service
-    if _drive_service is None:
-        _drive_service = GoogleDriveService()
-    return _drive_service
+    """Get or create cached Google Drive service instance."""
+    return GoogleDriveService()
@@ -3,16 +3,35 @@ Google Sheets integration for task metadata storage.
 Provides CRUD operations for the task database.
 """
 
-import os
+import re
+import threading
+import time
+from dataclasses import dataclass
 from datetime import datetime
 from typing import List, Dict, Optional
 import gspread
-from google.oauth2 import service_account
+from google.auth.transport.requests import AuthorizedSession
+from requests.adapters import HTTPAdapter
+from gspread.utils import absolute_range_name, numericise_all, rowcol_to_a1
 from utils.logger import setup_logger, log_api_call, log_error
-from config import get_service_account_path, get_sheets_id, SHEETS_HEADERS, TASK_STATUSES
+from config import load_service_account_credentials, get_sheets_id, SHEETS_HEADERS, TASK_STATUSES
 
 logger = setup_logger(__name__)
 
+# Header name -> 1-based column index and A1 column letter, built once
+HEADER_COL = {header: i for i, header in enumerate(SHEETS_HEADERS, start=1)}
+HEADER_COL_LETTER = {header: rowcol_to_a1(1, col)[:-1] for header, col in HEADER_COL.items()}
+
+# Keep-alive connections kept per host, shared by all sessions using the
+# cached service (sheets.googleapis.com, docs.google.com, www.googleapis.com)
+SHEETS_HTTP_POOL_SIZE = 16
+
+# Row ranges per values.batchGet call; ranges travel in the URL, so keep it bounded
+BATCH_GET_MAX_RANGES = 100
+
+# Row number of the last cell in an A1 range, e.g. "Sheet1!A12:H12" -> 12
+_RANGE_END_ROW_RE = re.compile(r"(\d+)$")
+
 class GoogleSheetsService:
     """Service for interacting with Google Sheets API."""
     
@@ -26,25 +45,14 @@ class GoogleSheetsService:
     def _initialize_service(self):
         """Set up Google Sheets API client."""
         try:
-            service_account_path = get_service_account_path()
-            
-            if not os.path.exists(service_account_path):
-                raise FileNotFoundError(f"Service account file not found: {service_account_path}")
+            # Shared, cached credentials (also used by the Drive service)
+            credentials = load_service_account_credentials()
             
-            # Define required scopes
-            SCOPES = [
-                'https://www.googleapis.com/auth/spreadsheets',
-                'https://www.googleapis.com/auth/drive.file'
-            ]
-            
-            # Load credentials
-            credentials = service_account.Credentials.from_service_account_file(
-                service_account_path,
-                scopes=SCOPES
-            )
-            
-            # Initialize gspread client
-            self.client = gspread.authorize(credentials)
+            # Initialize gspread client on a pooled session so concurrent
+            # requests reuse keep-alive connections instead of new TLS handshakes
+            session = AuthorizedSession(credentials)
+            session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=SHEETS_HTTP_POOL_SIZE))
+            self.client = gspread.authorize(credentials, session=session)
             
             # Open the spreadsheet
             self.spreadsheet = self.client.open_by_key(self.sheet_id)
@@ -52,6 +60,11 @@ class GoogleSheetsService:
             # Get or create the main worksheet
             self.worksheet = self._get_or_create_worksheet()
             
+            # Next task ID (header is row 1, so this is also the next data
+            # row's index). Counted once here instead of on every insert.
+            self._next_row = len(self.worksheet.col_values(1))
+            self._row_lock = threading.Lock()
+            
             logger.info("Google Sheets service initialized successfully")
             
         except Exception as e:
@@ -64,8 +77,8 @@ class GoogleSheetsService:
             # Try to get the first worksheet
             worksheet = self.spreadsheet.sheet1
             
-            # Check if headers exist
-            if not worksheet.row_values(1):
+            # Check if headers exist; the first header cell is enough to tell
+            if not worksheet.acell('A1').value:
                 # Initialize headers
                 worksheet.append_row(SHEETS_HEADERS)
                 logger.info("Initialized worksheet with headers")
@@ -87,28 +100,41 @@ class GoogleSheetsService:
             Task ID (row number)
         """
         try:
-            start_time = datetime.now()
-            
-            # Generate task ID (next row number)
-            all_values = self.worksheet.get_all_values()
-            task_id = len(all_values)  # Header is row 1, so this gives us the next row
-            
-            # Prepare row data matching SHEETS_HEADERS
-            row = [
-                str(task_id),
-                task_data.get('task_name', 'Untitled Task'),
-                task_data.get('upload_date', datetime.now().strftime('%Y-%m-%d %H:%M:%S')),
-                task_data.get('status', 'In Review'),
-                task_data.get('file_type', ''),
-                task_data.get('evidence_link', ''),
-                task_data.get('ai_summary', ''),
-                task_data.get('context_notes', '')
-            ]
-            
-            # Append to sheet
-            self.worksheet.append_row(row)
-            
-            duration_ms = (datetime.now() - start_time).total_seconds() * 1000
+            start_ns = time.perf_counter_ns()
+            
+            # Reserve the task ID and append under the lock so concurrent
+            # sessions never hand out the same ID
+            with self._row_lock:
+                task_id = self._next_row
+                
+                # Prepare row data matching SHEETS_HEADERS
+                row = [
+                    str(task_id),
+                    task_data.get('task_name', 'Untitled Task'),
+                    task_data.get('upload_date', datetime.now().strftime('%Y-%m-%d %H:%M:%S')),
+                    task_data.get('status', 'In Review'),
+                    task_data.get('file_type', ''),
+                    task_data.get('evidence_link', ''),
+                    task_data.get('ai_summary', ''),
+                    task_data.get('context_notes', '')
+                ]
+                
+                # Append to sheet in a single values.append write. RAW stores the
+                # values as-is (no formula or date parsing).
+                response = self.worksheet.append_row(
+                    row,
+                    value_input_option='RAW',
+                    insert_data_option='INSERT_ROWS',
+                    table_range='A1'
+                )
+                
+                # Advance from the row the API actually wrote, so rows added
+                # outside this process don't leave the counter behind
+                updated_range = response.get('updates', {}).get('updatedRange', '')
+                match = _RANGE_END_ROW_RE.search(updated_range)
+                self._next_row = int(match.group(1)) if match else task_id + 1
+            
+            duration_ms = (time.perf_counter_ns() - start_ns) / 1e6
             log_api_call(logger, "Google Sheets", f"create_task: {task_data.get('task_name')}", duration_ms)
             
             return str(task_id)
@@ -125,12 +151,18 @@ class GoogleSheetsService:
             List of task dictionaries
         """
         try:
-            start_time = datetime.now()
+            start_ns = time.perf_counter_ns()
             
-            # Get all records (skipping header)
-            records = self.worksheet.get_all_records()
+            # Request only the cell values (partial response), then map rows
+            # onto the header row like get_all_records() does
+            response = self.spreadsheet.values_get(
+                absolute_range_name(self.worksheet.title),
+                params={'fields': 'values'}
+            )
+            values = response.get('values', [])
+            records = _to_task_records(values[0], values[1:]) if values else []
             
-            duration_ms = (datetime.now() - start_time).total_seconds() * 1000
+            duration_ms = (time.perf_counter_ns() - start_ns) / 1e6
             log_api_call(logger, "Google Sheets", "get_all_tasks", duration_ms)
             
             return records
@@ -139,26 +171,66 @@ class GoogleSheetsService:
             log_error(logger, e, "Failed to get all tasks")
             return []
     
-    def get_tasks_by_status(self, status: str) -> List[Dict[str, str]]:
+    def get_last_modified(self) -> Optional[str]:
         """
-        Retrieve tasks filtered by status.
+        Get the spreadsheet's last modified time from Drive metadata.
+        
+        This is a small metadata request, so callers can use it as a cache
+        key and skip re-reading the sheet when nothing changed.
         
-        Args:
-            status: Status to filter by (from TASK_STATUSES)
-            
         Returns:
-            List of matching task dictionaries
+            RFC 3339 modified timestamp, or None if it could not be read
         """
         try:
-            all_tasks = self.get_all_tasks()
-            filtered = [task for task in all_tasks if task.get('Status') == status]
+            start_ns = time.perf_counter_ns()
             
-            logger.info(f"Retrieved {len(filtered)} tasks with status: {status}")
-            return filtered
+            modified_time = self.spreadsheet.get_lastUpdateTime()
+            
+            duration_ms = (time.perf_counter_ns() - start_ns) / 1e6
+            log_api_call(logger, "Google Drive", "get_last_modified", duration_ms)
+            
+            return modified_time
             
         except Exception as e:
-            log_error(logger, e, f"Failed to get tasks by status: {status}")
+            log_error(logger, e, "Failed to get sheet modified time")
+            return None
+    
+    def _get_tasks_where(self, header: str, predicate) -> List[Dict[str, str]]:
+        """
+        Fetch only the rows whose value in one column matches a predicate.
+        
+        Downloads that single column, picks the matching row numbers locally,
+        then reads just those rows (contiguous runs merged into one range)
+        with values.batchGet.
+        
+        Args:
+            header: Column to filter on (from SHEETS_HEADERS)
+            predicate: Called with each cell value; truthy keeps the row
+            
+        Returns:
+            List of matching task dictionaries
+        """
+        column = self.worksheet.col_values(HEADER_COL[header])
+        row_nums = [row_num for row_num, value in enumerate(column[1:], start=2) if predicate(value)]
+        if not row_nums:
             return []
+        
+        # Merge consecutive row numbers into (first, last) runs
+        runs = []
+        for row_num in row_nums:
+            if runs and runs[-1][1] == row_num - 1:
+                runs[-1][1] = row_num
+            else:
+                runs.append([row_num, row_num])
+        
+        last_col = HEADER_COL_LETTER[SHEETS_HEADERS[-1]]
+        ranges = [f"A{first}:{last_col}{last}" for first, last in runs]
+        
+        rows = []
+        for i in range(0, len(ranges), BATCH_GET_MAX_RANGES):
+            for value_range in self.worksheet.batch_get(ranges[i:i + BATCH_GET_MAX_RANGES]):
+                rows.extend(value_range)
+        return _to_task_records(SHEETS_HEADERS, rows)
     
     def update_task_status(self, task_id: str, new_status: str) -> bool:
         """
@@ -175,18 +247,15 @@ class GoogleSheetsService:
             if new_status not in TASK_STATUSES:
                 raise ValueError(f"Invalid status: {new_status}")
             
-            start_time = datetime.now()
+            start_ns = time.perf_counter_ns()
             
             # Find the row (task_id is the row number)
             row_num = int(task_id) + 1  # +1 because row 1 is header
             
-            # Find the column index for Status (4th column in SHEETS_HEADERS)
-            status_col_index = SHEETS_HEADERS.index('Status') + 1  # +1 for 1-indexed
-            
             # Update the cell
-            self.worksheet.update_cell(row_num, status_col_index, new_status)
+            self.worksheet.update_cell(row_num, HEADER_COL['Status'], new_status)
             
-            duration_ms = (datetime.now() - start_time).total_seconds() * 1000
+            duration_ms = (time.perf_counter_ns() - start_ns) / 1e6
             log_api_call(logger, "Google Sheets", f"update_task_status: {task_id} -> {new_status}", duration_ms)
             
             return True
@@ -207,18 +276,21 @@ class GoogleSheetsService:
             Success boolean
         """
         try:
-            start_time = datetime.now()
+            start_ns = time.perf_counter_ns()
             
             # Find the row (task_id is the row number)
             row_num = int(task_id) + 1  # +1 because row 1 is header
             
-            # Update each field
-            for field_name, new_value in updates.items():
-                if field_name in SHEETS_HEADERS:
-                    col_index = SHEETS_HEADERS.index(field_name) + 1  # +1 for 1-indexed
-                    self.worksheet.update_cell(row_num, col_index, new_value)
+            # Write all changed fields in one values.batchUpdate request
+            batch = [
+                {'range': f"{HEADER_COL_LETTER[field_name]}{row_num}", 'values': [[new_value]]}
+                for field_name, new_value in updates.items()
+                if field_name in HEADER_COL_LETTER
+            ]
+            if batch:
+                self.worksheet.batch_update(batch, value_input_option='USER_ENTERED')
             
-            duration_ms = (datetime.now() - start_time).total_seconds() * 1000
+            duration_ms = (time.perf_counter_ns() - start_ns) / 1e6
             log_api_call(logger, "Google Sheets", f"update_task: {task_id}", duration_ms)
             
             return True
@@ -227,30 +299,40 @@ class GoogleSheetsService:
             log_error(logger, e, f"Failed to update task: {task_id}")
             return False
     
-    def get_tasks_by_date_range(self, start_date: datetime, end_date: datetime) -> List[Dict[str, str]]:
+    def get_tasks_by_date_range(self, start_date: datetime, end_date: datetime,
+                                tasks: Optional[List[Dict[str, str]]] = None) -> List[Dict[str, str]]:
         """
         Get tasks within a date range.
         
+        Without a task list, only the Upload Date column is downloaded and
+        parsed locally, then just the matching rows are fetched. (A Sheets
+        query can't be used here: it casts the column to its majority type
+        and blanks cells of the other type, silently dropping rows.)
+        
         Args:
             start_date: Start of date range
             end_date: End of date range
+            tasks: Already-fetched tasks to filter (reads the sheet if None)
             
         Returns:
             List of matching tasks
         """
         try:
-            all_tasks = self.get_all_tasks()
-            
-            filtered = []
-            for task in all_tasks:
-                upload_date_str = task.get('Upload Date', '')
-                if upload_date_str:
-                    try:
-                        upload_date = datetime.strptime(upload_date_str, '%Y-%m-%d %H:%M:%S')
-                        if start_date <= upload_date <= end_date:
-                            filtered.append(task)
-                    except ValueError:
-                        continue
+            if tasks is None:
+                start_ns = time.perf_counter_ns()
+                
+                filtered = self._get_tasks_where(
+                    'Upload Date',
+                    lambda value: _in_date_range(value, start_date, end_date)
+                )
+                
+                duration_ms = (time.perf_counter_ns() - start_ns) / 1e6
+                log_api_call(logger, "Google Sheets", "get_tasks_by_date_range", duration_ms)
+            else:
+                filtered = [
+                    task for task in tasks
+                    if _in_date_range(task.get('Upload Date', ''), start_date, end_date)
+                ]
             
             logger.info(f"Retrieved {len(filtered)} tasks in date range")
             return filtered
@@ -259,6 +341,24 @@ class GoogleSheetsService:
             log_error(logger, e, "Failed to get tasks by date range")
             return []
 
+def _to_task_records(headers: List[str], rows) -> List[Dict[str, str]]:
+    """Turn raw sheet rows into task dicts, padding short rows and numericising values."""
+    width = len(headers)
+    return [
+        dict(zip(headers, numericise_all(row + [''] * (width - len(row)))))
+        for row in rows
+    ]
+
+def _in_date_range(upload_date_str: str, start_date: datetime, end_date: datetime) -> bool:
+    """Check whether an Upload Date cell falls within [start_date, end_date]."""
+    if not upload_date_str:
+        return False
+    try:
+        upload_date = datetime.strptime(upload_date_str, '%Y-%m-%d %H:%M:%S')
+    except ValueError:
+        return False
+    return start_date <= upload_date <= end_date
+
 import streamlit as st
 
 # Singleton instance with caching
@@ -274,3 +374,30 @@ def get_cached_tasks():
     service = get_sheets_service()
     return service.get_all_tasks()
 
+@dataclass
+class TaskTable:
+    """
+    Column-oriented snapshot of the task list.
+    Entry i of each column describes rows[i], so filters can scan a few
+    flat lists and only touch the row dicts they keep.
+    """
+    rows: List[Dict[str, str]]
+    names_lc: List[str]
+    statuses: List[str]
+    file_types: List[str]
+
+@st.cache_data(ttl=60)
+def get_cached_task_table() -> TaskTable:
+    """Get cached tasks in columnar form for filtering (refreshes every 60 seconds)."""
+    tasks = get_cached_tasks()
+    return TaskTable(
+        rows=tasks,
+        names_lc=[str(task.get('Task Name', '')).casefold() for task in tasks],
+        statuses=[task.get('Status', 'In Review') for task in tasks],
+        file_types=[task.get('File Type', '') for task in tasks]
+    )
+
+def clear_task_caches():
+    """Drop cached task data so the next read refetches from the sheet."""
+    get_cached_tasks.clear()
+    get_cached_task_table.clear()
@@ -0,0 +1,65 @@
+"""
+AppTest coverage for the AI Chat page.
+Sheets and Gemini are replaced with in-memory fakes, so no credentials are needed.
+"""
+
+from pathlib import Path
+from unittest import mock
+
+from streamlit.testing.v1 import AppTest
+
+PAGE = str(Path(__file__).resolve().parent.parent / "pages" / "5_💬_AI_Chat.py")
+
+TASKS = [{"Task ID": 1, "Task Name": "Login", "Status": "Done", "File Type": "video", "AI Summary": "ok"}]
+
+def _load_context(at):
+    at.session_state["context_loaded"] = False
+    at.run()
+    next(b for b in at.button if b.label.startswith("🔄 Load Context")).click().run()
+    assert not at.exception
+
+def _sheets(modified_time):
+    sheets = mock.Mock()
+    sheets.get_last_modified.return_value = modified_time
+    sheets.get_all_tasks.return_value = TASKS
+    return sheets
+
+def test_unknown_sheet_revision_bypasses_context_cache():
+    sheets = _sheets(None)
+    with mock.patch("services.google_sheets.get_sheets_service", return_value=sheets), \
+         mock.patch("services.gemini_processor.get_gemini_processor"):
+        at = AppTest.from_file(PAGE, default_timeout=30)
+        _load_context(at)
+        _load_context(at)
+    
+    assert sheets.get_all_tasks.call_count == 2
+    assert at.session_state["task_count"] == 1
+
+def test_known_sheet_revision_is_served_from_context_cache():
+    sheets = _sheets("2024-05-01T10:00:00.000Z")
+    with mock.patch("services.google_sheets.get_sheets_service", return_value=sheets), \
+         mock.patch("services.gemini_processor.get_gemini_processor"):
+        at = AppTest.from_file(PAGE, default_timeout=30)
+        _load_context(at)
+        _load_context(at)
+    
+    assert sheets.get_all_tasks.call_count == 1
+
+def test_stop_after_failed_stream_does_not_append_stale_partial():
+    def failing_stream(prompt):
+        yield "partial answer"
+        raise RuntimeError("connection reset")
+    
+    gemini = mock.Mock()
+    gemini.stream_chat.side_effect = failing_stream
+    with mock.patch("services.google_sheets.get_sheets_service"), \
+         mock.patch("services.gemini_processor.get_gemini_processor", return_value=gemini):
+        at = AppTest.from_file(PAGE, default_timeout=30)
+        at.session_state["pending_prompt"] = "What tasks are in review?"
+        at.run()
+        assert not at.exception
+        
+        next(b for b in at.button if b.label == "⏹️ Stop generating").click().run()
+    
+    contents = [message["content"] for message in at.session_state["chat_messages"]]
+    assert not any("(stopped)" in content for content in contents)
@@ -0,0 +1,53 @@
+"""
+Tests for credential lookup in config.
+"""
+
+import logging
+from unittest import mock
+
+import config
+
+def _secrets(error):
+    secrets = mock.MagicMock()
+    secrets.__contains__.return_value = True
+    secrets.__getitem__.side_effect = error
+    return secrets
+
+def _service_account_path(secrets):
+    with mock.patch.object(config, "_HAS_SA_FILE", False), \
+         mock.patch.object(config.st, "secrets", secrets):
+        config._write_service_account_secrets.cache_clear()
+        try:
+            return config.get_service_account_path()
+        finally:
+            config._write_service_account_secrets.cache_clear()
+
+def test_missing_secrets_fall_back_quietly(caplog):
+    with caplog.at_level(logging.ERROR):
+        assert _service_account_path(_secrets(KeyError("service_account"))) == 'service_account.json'
+    assert not caplog.records
+
+def test_unexpected_secrets_error_is_logged(caplog):
+    with caplog.at_level(logging.ERROR):
+        assert _service_account_path(_secrets(PermissionError("denied"))) == 'service_account.json'
+    assert any("denied" in record.getMessage() for record in caplog.records)
+
+def test_missing_value_is_looked_up_again():
+    config.get_sheets_id.cache_clear()
+    try:
+        with mock.patch.object(config.os, "getenv", return_value=None), \
+             mock.patch.object(config.st, "secrets", {}):
+            assert config.get_sheets_id() is None
+        with mock.patch.object(config.os, "getenv", return_value="sheet-1"):
+            assert config.get_sheets_id() == "sheet-1"
+    finally:
+        config.get_sheets_id.cache_clear()
+
+def test_service_account_info_returns_a_copy():
+    with mock.patch.object(config.st, "secrets", {"service_account": {"client_email": "a@b"}}):
+        config._load_service_account_info.cache_clear()
+        try:
+            config.get_service_account_info()["client_email"] = "changed"
+            assert config.get_service_account_info()["client_email"] == "a@b"
+        finally:
+            config._load_service_account_info.cache_clear()
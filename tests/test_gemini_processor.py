@@ -0,0 +1,65 @@
+"""
+Tests for GeminiProcessor request building, run without the API.
+"""
+
+import threading
+from unittest import mock
+
+from google.api_core.exceptions import ResourceExhausted
+
+from prompts.templates import REQUIREMENT_DOCUMENT_PROMPT
+from services import gemini_processor
+from services.gemini_processor import GeminiProcessor
+
+TASKS = [{"Task Name": "Login bug", "AI Summary": "Fails on submit"}]
+
+def _processor():
+    processor = GeminiProcessor.__new__(GeminiProcessor)
+    processor._generate = mock.Mock(return_value=[])
+    return processor
+
+def test_streamed_requirement_doc_sends_one_full_prompt():
+    processor = _processor()
+    
+    list(processor.stream_requirement_doc(TASKS))
+    
+    (prompt,), kwargs = processor._generate.call_args
+    assert prompt.startswith(f"{REQUIREMENT_DOCUMENT_PROMPT}\n\nTasks:\n### Task 1: Login bug")
+    assert kwargs == {'stream': True}
+
+def test_upload_is_reused_for_a_known_digest():
+    processor = _processor()
+    uploaded = mock.Mock()
+    uploaded.name = "files/abc"
+    uploaded.state.name = "ACTIVE"
+    
+    with mock.patch.object(gemini_processor.genai, 'upload_file', return_value=uploaded) as upload_file, \
+         mock.patch.object(gemini_processor.genai, 'get_file', return_value=uploaded):
+        processor._upload_via_temp_file(b"%PDF", "digest-1", '.pdf')
+        again = processor._upload_via_temp_file(b"%PDF", "digest-1", '.pdf')
+    
+    upload_file.assert_called_once()
+    assert again is uploaded
+
+def test_quota_error_on_first_streamed_chunk_switches_key():
+    def exhausted_stream():
+        raise ResourceExhausted("quota")
+        yield
+    
+    processor = GeminiProcessor.__new__(GeminiProcessor)
+    processor._api_keys = ["key-1", "key-2"]
+    processor._key_index = 0
+    processor._key_lock = threading.Lock()
+    processor._limiter = mock.Mock()
+    models = [mock.Mock(), mock.Mock()]
+    models[0].generate_content.return_value = exhausted_stream()
+    models[1].generate_content.return_value = iter(["chunk"])
+    processor.model = models[0]
+    
+    def configure_key():
+        processor.model = models[processor._key_index]
+    
+    processor._configure_key = configure_key
+    
+    assert list(processor._generate("prompt", stream=True)) == ["chunk"]
+    assert processor._key_index == 1
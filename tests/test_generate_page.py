@@ -0,0 +1,41 @@
+"""
+AppTest coverage for the Generate Outputs page.
+Sheets and Gemini are replaced with in-memory fakes, so no credentials are needed.
+"""
+
+from pathlib import Path
+from unittest import mock
+
+from streamlit.testing.v1 import AppTest
+
+PAGE = str(Path(__file__).resolve().parent.parent / "pages" / "3_⚡_Generate.py")
+
+CSV = "Title,Steps\nLogin works,Open app\n"
+ROWS = [{"Title": "Login works", "Steps": "Open app"}]
+TASKS = [{"Task ID": 1, "Task Name": "Login", "Status": "Done", "File Type": "video",
+          "Upload Date": "2024-01-01 10:00:00"}]
+
+def _fake_gemini():
+    gemini = mock.Mock()
+    gemini.generate_test_cases.return_value = (CSV, ROWS)
+    gemini.generate_requirement_doc.return_value = "# Requirements"
+    gemini.generate_scrum_email.return_value = "Subject: Weekly update"
+    return gemini
+
+def test_generate_all_with_test_cases_already_in_session():
+    gemini = _fake_gemini()
+    with mock.patch("services.google_sheets.get_sheets_service"), \
+         mock.patch("services.google_sheets.get_cached_tasks", return_value=TASKS), \
+         mock.patch("services.gemini_processor.get_gemini_processor", return_value=gemini):
+        at = AppTest.from_file(PAGE, default_timeout=30)
+        at.session_state["test_cases_csv"] = CSV
+        at.session_state["test_cases_rows"] = ROWS
+        at.run()
+        assert not at.exception
+        
+        next(b for b in at.button if b.label == "🚀 Generate All Outputs").click().run()
+    
+    assert not at.exception
+    assert not [e.value for e in at.error]
+    assert "Generated 2 outputs!" in [s.value for s in at.success]
+    gemini.generate_test_cases.assert_called_once()
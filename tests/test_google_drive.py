@@ -0,0 +1,43 @@
+"""
+Tests for the Drive service helpers, run without the API.
+"""
+
+import io
+import threading
+from unittest import mock
+
+import httplib2
+from google.auth.credentials import AnonymousCredentials
+from googleapiclient.discovery import build
+
+from services import google_drive
+
+def test_requests_from_short_lived_threads_reuse_one_pooled_connection():
+    credentials = AnonymousCredentials()
+    pool = google_drive._HttpPool(credentials, size=2)
+    service = build(
+        'drive', 'v3', credentials=credentials,
+        requestBuilder=lambda http, *args, **kwargs: google_drive._PooledHttpRequest(pool, http, *args, **kwargs)
+    )
+    
+    connections = []
+    
+    def fake_request(self, uri, method='GET', body=None, headers=None, **kwargs):
+        connections.append(self)
+        return httplib2.Response({'status': '200'}), b'{"files": []}'
+    
+    with mock.patch.object(google_drive.AuthorizedHttp, 'request', fake_request):
+        for _ in range(3):
+            thread = threading.Thread(target=lambda: service.files().list(q="trashed=false").execute())
+            thread.start()
+            thread.join()
+    
+    assert len(connections) == 3
+    assert len(set(map(id, connections))) == 1
+
+def test_remaining_size_leaves_stream_position_unchanged():
+    file_data = io.BytesIO(b"x" * 10)
+    file_data.seek(4)
+    
+    assert google_drive._remaining_size(file_data) == 6
+    assert file_data.tell() == 4
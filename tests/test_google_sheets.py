@@ -0,0 +1,54 @@
+"""
+Tests for GoogleSheetsService query paths, run against in-memory fakes.
+"""
+
+from datetime import datetime
+from unittest import mock
+
+from config import SHEETS_HEADERS
+from services.google_sheets import GoogleSheetsService
+
+ROWS = [
+    ["1", "Login bug", "2024-05-01 09:00:00", "Done", "video", "", "", ""],
+    ["2", "Spec", "2024-05-02 09:00:00", "In Review", "document", "", "", ""],
+    ["3", "Crash", "2024-05-03 09:00:00", "Done", "image", "", "", ""],
+]
+
+class FakeWorksheet:
+    """Just enough of gspread.Worksheet for the column + batchGet paths."""
+    
+    def __init__(self, rows):
+        self.values = [SHEETS_HEADERS] + rows
+    
+    def col_values(self, col):
+        return [row[col - 1] for row in self.values]
+    
+    def batch_get(self, ranges):
+        result = []
+        for cell_range in ranges:
+            first, last = cell_range.split(':')
+            result.append(self.values[int(first[1:]) - 1:int(last[1:])])
+        return result
+
+def _service():
+    service = GoogleSheetsService.__new__(GoogleSheetsService)
+    service.sheet_id = "sheet"
+    service.worksheet = FakeWorksheet(ROWS)
+    return service
+
+def test_date_range_without_tasks_reads_only_matching_rows():
+    service = _service()
+    service.worksheet.batch_get = mock.Mock(wraps=service.worksheet.batch_get)
+    
+    tasks = service.get_tasks_by_date_range(datetime(2024, 5, 2), datetime(2024, 5, 3, 23, 59))
+    
+    assert [task['Task Name'] for task in tasks] == ["Spec", "Crash"]
+    service.worksheet.batch_get.assert_called_once_with(["A3:H4"])
+
+def test_date_range_filters_supplied_tasks_locally():
+    service = _service()
+    supplied = [dict(zip(SHEETS_HEADERS, row)) for row in ROWS]
+    
+    tasks = service.get_tasks_by_date_range(datetime(2024, 5, 1), datetime(2024, 5, 1, 23, 59), tasks=supplied)
+    
+    assert [task['Task Name'] for task in tasks] == ["Login bug"]
@@ -0,0 +1,28 @@
+"""
+AppTest coverage for toasts that must survive an immediate st.rerun().
+"""
+
+from streamlit.testing.v1 import AppTest
+
+def _board_like_app():
+    import streamlit as st
+    from utils.toast import success_toast, show_pending_toasts
+    
+    show_pending_toasts()
+    if st.button("Save"):
+        success_toast("Task updated successfully!", before_rerun=True)
+        st.rerun()
+
+def test_toast_queued_before_rerun_is_shown_on_next_run():
+    at = AppTest.from_function(_board_like_app)
+    at.run()
+    assert not at.toast
+    
+    at.button[0].click().run()
+    
+    assert not at.exception
+    assert [t.value for t in at.toast] == ["Task updated successfully!"]
+    
+    # Shown once, not on every later run
+    at.run()
+    assert not at.toast
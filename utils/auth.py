@@ -5,18 +5,23 @@ Password-based access control.
 
 import streamlit as st
 import hashlib
+import hmac
 
 # Password hash (for security - don't store plain text)
 # Password: 987654321
 PASSWORD_HASH = "8a9bcf1e51e812d0af8465a8dbcc9f741064bf0af3b3d08e6b0246437c19f7fb"
 
+# Raw digest of PASSWORD_HASH, decoded once for comparisons
+_PASSWORD_DIGEST = bytes.fromhex(PASSWORD_HASH)
+
 def hash_password(password: str) -> str:
     """Hash a password using SHA256."""
     return hashlib.sha256(password.encode()).hexdigest()
 
 def check_password(password: str) -> bool:
-    """Check if the provided password is correct."""
-    return hash_password(password) == PASSWORD_HASH
+    """Check if the provided password is correct (constant-time comparison)."""
+    digest = hashlib.sha256(password.encode()).digest()
+    return hmac.compare_digest(digest, _PASSWORD_DIGEST)
 
 def is_authenticated() -> bool:
     """Check if user is authenticated."""
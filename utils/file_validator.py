@@ -4,8 +4,16 @@ Validates file types, sizes, and MIME types.
 """
 
 import os
-from pathlib import Path
-from config import ALLOWED_EXTENSIONS, MAX_FILE_SIZE_MB
+from config import ALLOWED_EXTENSIONS, EXT_TO_CATEGORY, MAX_FILE_SIZE_MB
+
+# Size limit in bytes, computed once
+MAX_FILE_SIZE_BYTES = MAX_FILE_SIZE_MB << 20
+
+def _file_extension(filename: str) -> str:
+    """Return the lowercased extension including the dot (like Path.suffix), or ''."""
+    dot = filename.rfind('.')
+    # A leading dot marks a hidden file, not an extension
+    return filename[dot:].lower() if dot > 0 else ''
 
 def validate_file_type(filename: str) -> tuple[bool, str]:
     """
@@ -17,10 +25,10 @@ def validate_file_type(filename: str) -> tuple[bool, str]:
     Returns:
         (is_valid, message): Tuple of validation result and message
     """
-    file_ext = Path(filename).suffix.lower()
+    file_ext = _file_extension(filename)
     
     if file_ext not in ALLOWED_EXTENSIONS:
-        allowed = ", ".join(ALLOWED_EXTENSIONS)
+        allowed = ", ".join(sorted(ALLOWED_EXTENSIONS))
         return False, f"File type '{file_ext}' not allowed. Allowed types: {allowed}"
     
     return True, "File type is valid"
@@ -35,9 +43,7 @@ def validate_file_size(file_size_bytes: int) -> tuple[bool, str]:
     Returns:
         (is_valid, message): Tuple of validation result and message
     """
-    max_size_bytes = MAX_FILE_SIZE_MB * 1024 * 1024
-    
-    if file_size_bytes > max_size_bytes:
+    if file_size_bytes > MAX_FILE_SIZE_BYTES:
         size_mb = file_size_bytes / (1024 * 1024)
         return False, f"File size ({size_mb:.1f}MB) exceeds maximum allowed size ({MAX_FILE_SIZE_MB}MB)"
     
@@ -53,15 +59,7 @@ def get_file_category(filename: str) -> str:
     Returns:
         Category string: 'video', 'document', 'spreadsheet', or 'image'
     """
-    from config import ALLOWED_FILE_TYPES
-    
-    file_ext = Path(filename).suffix.lower()
-    
-    for category, extensions in ALLOWED_FILE_TYPES.items():
-        if file_ext in extensions:
-            return category
-    
-    return "unknown"
+    return EXT_TO_CATEGORY.get(_file_extension(filename), "unknown")
 
 def validate_uploaded_file(uploaded_file) -> tuple[bool, str, str]:
     """
@@ -73,16 +71,16 @@ def validate_uploaded_file(uploaded_file) -> tuple[bool, str, str]:
     Returns:
         (is_valid, message, category): Validation result, message, and file category
     """
+    # Validate file size first: a plain integer compare on known metadata
+    is_valid_size, size_message = validate_file_size(uploaded_file.size)
+    if not is_valid_size:
+        return False, size_message, ""
+    
     # Validate file type
     is_valid_type, type_message = validate_file_type(uploaded_file.name)
     if not is_valid_type:
         return False, type_message, ""
     
-    # Validate file size
-    is_valid_size, size_message = validate_file_size(uploaded_file.size)
-    if not is_valid_size:
-        return False, size_message, ""
-    
     # Get file category
     category = get_file_category(uploaded_file.name)
     
@@ -5,15 +5,17 @@ Provides structured logging for debugging and monitoring.
 
 import logging
 import sys
-from datetime import datetime
+from functools import lru_cache
 
 # Configure logging format
 LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
 
+@lru_cache(maxsize=None)
 def setup_logger(name: str, level=logging.INFO):
     """
     Set up a logger with the specified name and level.
+    Cached, so repeated calls for the same name skip the setup entirely.
     
     Args:
         name: Name of the logger (usually __name__)
@@ -51,10 +53,13 @@ def log_api_call(logger, service: str, operation: str, duration_ms: float = None
         operation: Operation performed (e.g., 'upload_file', 'analyze_video')
         duration_ms: Duration in milliseconds (optional)
     """
+    # Formatting is left to logging, so nothing is built when INFO is filtered
+    if not logger.isEnabledFor(logging.INFO):
+        return
     if duration_ms:
-        logger.info(f"{service} - {operation} completed in {duration_ms:.2f}ms")
+        logger.info("%s - %s completed in %.2fms", service, operation, duration_ms)
     else:
-        logger.info(f"{service} - {operation} started")
+        logger.info("%s - %s started", service, operation)
 
 def log_error(logger, error: Exception, context: str = ""):
     """
@@ -65,8 +70,12 @@ def log_error(logger, error: Exception, context: str = ""):
         error: Exception object
         context: Additional context about where the error occurred
     """
-    error_msg = f"{context}: {str(error)}" if context else str(error)
-    logger.error(error_msg, exc_info=True)
+    if not logger.isEnabledFor(logging.ERROR):
+        return
+    if context:
+        logger.error("%s: %s", context, error, exc_info=True)
+    else:
+        logger.error("%s", error, exc_info=True)
 
 # Create default application logger
 app_logger = setup_logger('ai_sprint_brain')
@@ -4,83 +4,41 @@ Provides success, error, info, and warning notifications.
 """
 
 import streamlit as st
-from datetime import datetime
-import time
 
-def show_toast(message: str, icon: str = "ℹ️", duration: int = 3):
+# Session key for toasts that should appear on the next run (see queue_toast)
+_PENDING_TOASTS_KEY = "_pending_toasts"
+
+def queue_toast(message: str, icon: str = "ℹ️"):
     """
-    Show a toast notification.
+    Queue a toast to show on the next run.
+    
+    Elements drawn right before st.rerun() are discarded before the browser
+    paints them, so confirmations that precede a rerun go through here and
+    are shown by show_pending_toasts() at the top of the next run.
     
     Args:
         message: Message to display
         icon: Emoji icon
-        duration: Duration in seconds
     """
-    toast_placeholder = st.empty()
-    
-    toast_html = f"""
-    <style>
-        @keyframes slideIn {{
-            from {{
-                transform: translateX(100%);
-                opacity: 0;
-            }}
-            to {{
-                transform: translateX(0);
-                opacity: 1;
-            }}
-        }}
-        
-        @keyframes slideOut {{
-            from {{
-                transform: translateX(0);
-                opacity: 1;
-            }}
-            to {{
-                transform: translateX(100%);
-                opacity: 0;
-            }}
-        }}
-        
-        .toast {{
-            position: fixed;
-            top: 20px;
-            right: 20px;
-            background: white;
-            border-radius: 8px;
-            padding: 12px 20px;
-            box-shadow: 0 4px 12px rgba(0,0,0,0.15);
-            display: flex;
-            align-items: center;
-            gap: 10px;
-            z-index: 9999;
-            animation: slideIn 0.3s ease-out;
-            max-width: 400px;
-        }}
-        
-        .toast-icon {{
-            font-size: 24px;
-        }}
-        
-        .toast-message {{
-            font-size: 14px;
-            color: #333;
-        }}
-    </style>
-    
-    <div class="toast">
-        <span class="toast-icon">{icon}</span>
-        <span class="toast-message">{message}</span>
-    </div>
+    st.session_state.setdefault(_PENDING_TOASTS_KEY, []).append((message, icon))
+
+def show_pending_toasts():
+    """Show (and clear) any toasts queued by queue_toast on the previous run."""
+    for message, icon in st.session_state.pop(_PENDING_TOASTS_KEY, []):
+        st.toast(message, icon=icon)
+
+def success_toast(message: str, before_rerun: bool = False):
     """
+    Show success toast.
     
-    toast_placeholder.markdown(toast_html, unsafe_allow_html=True)
-    time.sleep(duration)
-    toast_placeholder.empty()
-
-def success_toast(message: str):
-    """Show success toast."""
-    st.success(f"✅ {message}", icon="✅")
+    Args:
+        message: Message to display
+        before_rerun: Queue it for the next run because st.rerun() follows
+    """
+    if before_rerun:
+        queue_toast(message, icon="✅")
+    else:
+        st.success(f"✅ {message}", icon="✅")
 
 def error_toast(message: str):
     """Show error toast."""